@@ -1,61 +1,127 @@
 #!/usr/bin/env python3
 
+import argparse
 import os
 import subprocess
 import sys
 import time
 
-from anthropic import Anthropic
 from dotenv import load_dotenv
-from tokencost import calculate_cost_by_tokens
+
+# Modules shared between examples live in factor-01 and the repo root
+FACTOR_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [FACTOR_DIR, os.path.dirname(FACTOR_DIR)]
+from batch import add_batch_arguments, confirm, run_batch
+from lazy_imports import lazy_import
+from shared.pricing import CostLedger, anthropic_usage_tokens
+
+# Imported on first use so the prompt appears without waiting for it
+anthropic = lazy_import("anthropic")
 
 load_dotenv()
 
 MODEL = "claude-3-7-sonnet-20250219"
 SYSTEM_PROMPT = "You are a helpful assistant that provides shell commands. Give ONLY the command with no explanation or markdown formatting."
 
+# Running cost of every request in this session
+COST_LEDGER = CostLedger()
+
+_client = None
+
+
+def get_client():
+    """Get the process-wide Anthropic client, creating it on first use."""
+    global _client
+    if _client is None:
+        _client = anthropic.Anthropic()
+    return _client
+
+
+def handle_request(user_prompt):
+    """
+    Generate a command for one batch request and run it if approved.
+
+    Args:
+        user_prompt (str): Description of the shell command to run
+
+    Returns:
+        dict: Command, token usage, cost and, if it ran, its exit code and output
+    """
+    response = get_client().messages.create(
+        model=MODEL,
+        max_tokens=1000,
+        temperature=0,
+        system=SYSTEM_PROMPT,
+        messages=[{"role": "user", "content": user_prompt}],
+    )
+    command = response.content[0].text
+    result = {
+        "command": command,
+        "input_tokens": response.usage.input_tokens,
+        "output_tokens": response.usage.output_tokens,
+        "cost": COST_LEDGER.record(MODEL, **anthropic_usage_tokens(response.usage)),
+        "executed": False,
+    }
+    if confirm(f"\nExecute '{command}'? (y/n): "):
+        completed = subprocess.run(command, shell=True, text=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        result.update(executed=True, exit_code=completed.returncode, stdout=completed.stdout, stderr=completed.stderr)
+    return result
+
+
 def main():
+    parser = argparse.ArgumentParser(description="Generate a shell command from a description")
+    # Generated commands are arbitrary shell, so batch confirmations are always declined
+    add_batch_arguments(parser, allow_auto_approve=False)
+    args = parser.parse_args()
+
     # Check if ANTHROPIC_API_KEY is set
     if "ANTHROPIC_API_KEY" not in os.environ:
         print("Error: ANTHROPIC_API_KEY environment variable is not set")
         sys.exit(1)
     
-    # Create Anthropic client
-    client = Anthropic()
+    if args.batch:
+        run_batch(handle_request, args.batch, args.workers, args.auto_approve, COST_LEDGER)
+        return
+    
+    # Import the SDK while the user is typing
+    anthropic.preload()
     
     # Get user input
     user_prompt = input("Describe the shell command that you want to run: ")
     
-    # Send request to Anthropic API
+    # Create Anthropic client
+    client = get_client()
+    
+    # Send request to Anthropic API, printing the response as it streams in
     print("\nProcessing your request...")
     start = time.time()
-    response = client.messages.create(
+    with client.messages.stream(
         model=MODEL,
         max_tokens=1000,
         temperature=0,
         system=SYSTEM_PROMPT,
         messages=[{"role": "user", "content": user_prompt}],
-    )
+    ) as stream:
+        print("\nClaude's response:")
+        for text in stream.text_stream:
+            print(text, end="", flush=True)
+        print()
+        response = stream.get_final_message()
     end = time.time()
     
     # Get usage
     input_tokens = response.usage.input_tokens
-    input_cost = calculate_cost_by_tokens(input_tokens, MODEL, "input")
     output_tokens = response.usage.output_tokens
-    output_cost = calculate_cost_by_tokens(output_tokens, MODEL, "output")
+    cost = COST_LEDGER.record(MODEL, **anthropic_usage_tokens(response.usage))
     
-    # Print response
-    print(f"Tokens: {input_tokens} sent, {output_tokens} recv, Cost: ${input_cost + output_cost:.4f}, Time: {end - start:.2f}s")
+    # Print usage
+    print(f"\nTokens: {input_tokens} sent, {output_tokens} recv, Cost: ${cost:.4f}, Time: {end - start:.2f}s")
     
     # Get the command
     command = response.content[0].text
-    print("\nClaude's response:")
-    print(command)
     
     # Ask if user wants to execute the command
-    execute = input("\nDo you want to execute this command? (y/n): ").lower()
-    
-    if execute in ('y', 'yes'):
+    if confirm("\nDo you want to execute this command? (y/n): "):
         print(f"\nExecuting: '{command}'")
         result = subprocess.run(command, shell=True, text=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
         if result.returncode != 0:
@@ -1,31 +1,35 @@
 #!/usr/bin/env python3
 
+import argparse
+import asyncio
 import os
-import subprocess
+import shlex
 import sys
 import textwrap
 import time
 
-from anthropic import Anthropic
 from dotenv import load_dotenv
-from tokencost import calculate_cost_by_tokens
+
+# Modules shared between examples live in factor-01 and the repo root
+FACTOR_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [FACTOR_DIR, os.path.dirname(FACTOR_DIR)]
+from batch import add_batch_arguments, confirm, run_batch
+from lazy_imports import lazy_import
+from project_settings import project_settings
+from shared.pricing import CostLedger, anthropic_usage_tokens
+from tool_registry import ToolArgumentError, ToolRegistry
+
+# Imported on first use so the prompt appears without waiting for it
+anthropic = lazy_import("anthropic")
 
 load_dotenv()
 
 MODEL = "claude-3-7-sonnet-20250219"
 
-def project_settings():
-    """
-    Read project settings from a markdown file.
+# Running cost of every request in this session
+COST_LEDGER = CostLedger()
+
 
-    Returns:
-        str: Content of the PROJECT.md file
-    """
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    project_md_path = os.path.join(script_dir, "PROJECT.md")
-    with open(project_md_path, 'r') as file:
-        return file.read()
-    
 def render_system_prompt():
     """
     Render the system prompt for the LLM.
@@ -33,10 +37,11 @@ def render_system_prompt():
     Returns:
         str: System prompt string
     """
+    settings = project_settings()
     return textwrap.dedent(f"""\
     You are a cloud infrastructure assistant specialized in creating storage buckets. You help users provision cloud storage resources by executing commands through dedicated tools.
 
-    {project_settings()}
+    Default provider: {settings.provider.upper()}
 
     You have access to the following tools:
 
@@ -47,183 +52,397 @@ def render_system_prompt():
        Creates a Google Cloud Storage bucket with the specified name and region.
 
     When asked to create buckets:
-    - Use the project settings as defaults, but prioritize any specific values provided by the user
-    - Use the appropriate cloud provider tool based on user request or default provider
-    - Check if the user's bucket name already contains the global prefix; if not, apply it
-    - Apply the specified region for the selected provider or use the default from settings
-
-    Remember that any setting in the configuration can be overridden by the user's explicit request.
+    - Use the provider the user asks for, otherwise the default provider
+    - Pass the bucket name exactly as the user gave it; the tools apply the project prefix
+    - Only pass a region if the user asked for one; the tools apply the provider's default region
     """)
 
 
-def execute_command(command):
+def confirm_action(heading, action):
     """
-    Execute a shell command and return the output.
+    Show what is about to be run and ask the user whether to run it.
 
     Args:
-        command (str): The command to execute
+        heading (str): What kind of action this is, e.g. "Generated command"
+        action (str): The command or SDK call to confirm
 
     Returns:
-        str: Output of the command execution
+        bool: True if the user confirmed
     """
-    # Ask if user wants to execute the command
-    print("\nGenerated command:")
-    print(command)
-    execute = input("\nDo you want to execute this command? (y/n): ").lower()
-    
-    output = ""
-    if execute in ('y', 'yes'):
-        output += f"\nExecuting: '{command}'\n"
-        result = subprocess.run(command, shell=True, text=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        if result.returncode != 0:
-            output += f"Command failed with exit code {result.returncode}\n"
-        if result.stdout:
-            output += f"Output:\n{result.stdout}\n"
-        if result.stderr:
-            output += f"Error:\n{result.stderr}\n"
-    else:
-        output += "Command execution cancelled.\n"
-    return output
-
-
-def create_aws_s3_bucket(bucket_name, region):
+    print(f"\n{heading}:")
+    print(action)
+    return confirm("\nDo you want to execute this command? (y/n): ")
+
+
+class SubprocessExecutor:
     """
-    Create an S3 bucket in AWS with the specified name and region.
+    Runs CLI commands as asyncio subprocesses.
+
+    stdout and stderr are streamed line by line as they are produced, and
+    several commands can run concurrently with run_many().
+    """
+
+    confirmation_heading = "Generated command"
+
+    async def _stream(self, stream, label, lines, output):
+        """Forward lines from a subprocess pipe as they arrive and collect them."""
+        async for raw_line in stream:
+            line = raw_line.decode(errors="replace")
+            lines.append(line)
+            output(f"[{label}] {line}", end="")
+
+    async def run(self, command, output=print):
+        """
+        Run a shell command, streaming its output.
+
+        Args:
+            command (str): The command to execute
+            output (callable): print-like function receiving output lines
+
+        Returns:
+            str: Output of the command execution
+        """
+        process = await asyncio.create_subprocess_shell(
+            command, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+        )
+        stdout_lines, stderr_lines = [], []
+        await asyncio.gather(
+            self._stream(process.stdout, "stdout", stdout_lines, output),
+            self._stream(process.stderr, "stderr", stderr_lines, output),
+        )
+        returncode = await process.wait()
+
+        result = f"\nExecuting: '{command}'\n"
+        if returncode != 0:
+            # Streamed output doesn't show the exit status, so report it too
+            output(f"Command failed with exit code {returncode}")
+            result += f"Command failed with exit code {returncode}\n"
+        if stdout_lines:
+            result += f"Output:\n{''.join(stdout_lines)}\n"
+        if stderr_lines:
+            result += f"Error:\n{''.join(stderr_lines)}\n"
+        return result
+
+    async def run_many(self, commands, output=print):
+        """
+        Run several shell commands concurrently.
+
+        Args:
+            commands (list): Commands to execute
+            output (callable): print-like function receiving output lines
+
+        Returns:
+            list: Output of each command, in order
+        """
+        return await asyncio.gather(*(self.run(command, output) for command in commands))
+
+    def describe_aws_s3_bucket(self, bucket_name, region):
+        return aws_s3_bucket_command(bucket_name, region)
+
+    def describe_gcs_bucket(self, bucket_name, region):
+        return gcs_bucket_command(bucket_name, region)
+
+    def create_aws_s3_bucket(self, bucket_name, region, output=print):
+        return asyncio.run(self.run(aws_s3_bucket_command(bucket_name, region), output))
+
+    def create_gcs_bucket(self, bucket_name, region, output=print):
+        return asyncio.run(self.run(gcs_bucket_command(bucket_name, region), output))
+
+
+class SdkExecutor:
+    """
+    Creates buckets in-process with the cloud SDKs.
+
+    Avoids starting the aws/gsutil CLI (about a second per call). SDK
+    clients are created on first use and reused.
+    """
+
+    confirmation_heading = "SDK call"
+
+    def __init__(self):
+        self._s3_clients = {}
+        self._gcs_client = None
+
+    def describe_aws_s3_bucket(self, bucket_name, region):
+        return f"Create S3 bucket s3://{bucket_name} in {region} with boto3 (s3.create_bucket)"
+
+    def describe_gcs_bucket(self, bucket_name, region):
+        return f"Create GCS bucket gs://{bucket_name} in {region} with google-cloud-storage (Client.create_bucket)"
+
+    def create_aws_s3_bucket(self, bucket_name, region, output=print):
+        import boto3
+
+        if region not in self._s3_clients:
+            self._s3_clients[region] = boto3.client('s3', region_name=region)
+        try:
+            if region == "us-east-1":
+                self._s3_clients[region].create_bucket(Bucket=bucket_name)
+            else:
+                self._s3_clients[region].create_bucket(
+                    Bucket=bucket_name,
+                    CreateBucketConfiguration={'LocationConstraint': region}
+                )
+        except Exception as e:
+            result = f"Bucket creation failed: {e}\n"
+        else:
+            result = f"Created bucket s3://{bucket_name} in {region}\n"
+        output(result, end="")
+        return result
+
+    def create_gcs_bucket(self, bucket_name, region, output=print):
+        from google.cloud import storage
+
+        if self._gcs_client is None:
+            self._gcs_client = storage.Client()
+        try:
+            self._gcs_client.create_bucket(bucket_name, location=region)
+        except Exception as e:
+            result = f"Bucket creation failed: {e}\n"
+        else:
+            result = f"Created bucket gs://{bucket_name} in {region}\n"
+        output(result, end="")
+        return result
+
+
+EXECUTORS = {
+    "sdk": SdkExecutor,
+    "subprocess": SubprocessExecutor,
+}
+
+_executor = None
+
+
+def get_executor():
+    """
+    Get the bucket executor selected by BUCKET_EXECUTOR (sdk or subprocess).
+
+    Returns:
+        Executor instance shared by all tools
+
+    Raises:
+        ValueError: If BUCKET_EXECUTOR names an unknown executor
+    """
+    global _executor
+    if _executor is None:
+        name = os.environ.get("BUCKET_EXECUTOR", "sdk")
+        if name not in EXECUTORS:
+            raise ValueError(
+                f"Unknown BUCKET_EXECUTOR {name!r}, expected one of: {', '.join(sorted(EXECUTORS))}"
+            )
+        _executor = EXECUTORS[name]()
+    return _executor
+
+
+def aws_s3_bucket_command(bucket_name, region):
+    """
+    Build the AWS CLI command that creates an S3 bucket.
 
     Args:
         bucket_name (str): Name of the S3 bucket to create
         region (str): AWS region where the S3 bucket will be created
 
     Returns:
-        str: Output of the command execution
+        str: aws s3api command
     """
+    # Arguments come from the LLM, so quote them for the shell
+    bucket_name, region = shlex.quote(bucket_name), shlex.quote(region)
     if region == "us-east-1":
-        command = f"aws s3api create-bucket --bucket {bucket_name} --region {region}"
-    else:
-        command = f"aws s3api create-bucket --bucket {bucket_name} --region {region} --create-bucket-configuration LocationConstraint={region}"
-    return execute_command(command)    
-        
+        return f"aws s3api create-bucket --bucket {bucket_name} --region {region}"
+    return f"aws s3api create-bucket --bucket {bucket_name} --region {region} --create-bucket-configuration LocationConstraint={region}"
+
 
-def create_gcs_bucket(bucket_name, region):
+def gcs_bucket_command(bucket_name, region):
     """
-    Create a Google Cloud Storage bucket with the specified name and region.
+    Build the gsutil command that creates a GCS bucket.
 
     Args:
         bucket_name (str): Name of the GCS bucket to create
         region (str): Google Cloud region where the GCS bucket will be created
 
     Returns:
-        str: Output of the command execution
+        str: gsutil command
     """
-    return execute_command(f"gsutil mb -l {region} gs://{bucket_name} ")
-
-
-TOOLS = {
-    "create_aws_s3_bucket": {
-        "name": "create_aws_s3_bucket",
-        "function": create_aws_s3_bucket,
-        "description": "Creates an S3 bucket in AWS with the specified name and region",
-        "parameters": {
-            "bucket_name": {
-                "description": "The name of the S3 bucket to create",
-                "type": "string",
-            },
-            "region": {
-                "description": "The AWS region where the S3 bucket will be created",
-                "type": "string",
-            },
+    return f"gsutil mb -l {shlex.quote(region)} {shlex.quote(f'gs://{bucket_name}')}"
+
+
+# Tools available to the LLM, registered below with @TOOLS.tool
+TOOLS = ToolRegistry()
+
+
+@TOOLS.tool(
+    "Creates an S3 bucket in AWS with the specified name and region",
+    {
+        "bucket_name": {"description": "The name of the S3 bucket to create", "type": "string"},
+        "region": {
+            "description": "The AWS region where the S3 bucket will be created (defaults to the project setting)",
+            "type": "string",
+            "required": False,
         },
     },
-    "create_gcs_bucket": {
-        "name": "create_gcs_bucket",
-        "function": create_gcs_bucket,
-        "description": "Creates a Google Cloud Storage bucket with the specified name and region",
-        "parameters": {
-            "bucket_name": {
-                "description": "The name of the GCS bucket to create",
-                "type": "string",
-            },
-            "region": {
-                "name": "region",
-                "description": "The Google Cloud region where the GCS bucket will be created",
-                "type": "string",
-            },
+)
+def create_aws_s3_bucket(bucket_name, region=None):
+    """
+    Create an S3 bucket in AWS with the specified name and region.
+
+    The project prefix and default AWS region from PROJECT.md are applied.
+
+    Args:
+        bucket_name (str): Name of the S3 bucket to create
+        region (str): AWS region where the S3 bucket will be created
+
+    Returns:
+        str: Output of the command execution
+    """
+    settings = project_settings()
+    bucket_name, region = settings.bucket_name(bucket_name), settings.region("aws", region)
+    executor = get_executor()
+    if not confirm_action(executor.confirmation_heading, executor.describe_aws_s3_bucket(bucket_name, region)):
+        print("Command execution cancelled.")
+        return "Command execution cancelled.\n"
+    return executor.create_aws_s3_bucket(bucket_name, region)
+
+
+@TOOLS.tool(
+    "Creates a Google Cloud Storage bucket with the specified name and region",
+    {
+        "bucket_name": {"description": "The name of the GCS bucket to create", "type": "string"},
+        "region": {
+            "description": "The Google Cloud region where the GCS bucket will be created (defaults to the project setting)",
+            "type": "string",
+            "required": False,
         },
     },
-}
+)
+def create_gcs_bucket(bucket_name, region=None):
+    """
+    Create a Google Cloud Storage bucket with the specified name and region.
 
+    The project prefix and default GCS region from PROJECT.md are applied.
 
-def get_tool_descriptions():
-    """Get descriptions of available tools in a format suitable for LLM tool calling.
+    Args:
+        bucket_name (str): Name of the GCS bucket to create
+        region (str): Google Cloud region where the GCS bucket will be created
 
     Returns:
-        List of tool descriptions compatible with LLM tool calling format
-    """
-    tool_descriptions = []
-    for tool_name, tool_info in TOOLS.items():
-        properties = {
-            param_name: {
-                "type": param_info["type"],
-                "description": param_info["description"],
-            }
-            for param_name, param_info in tool_info["parameters"].items()
-        }
-        tool_descriptions.append(
-            {
-                "type": "custom",
-                "name": tool_name,
-                "description": tool_info["description"],
-                "input_schema": {
-                    "type": "object",
-                    "properties": properties,
-                    "required": list(tool_info["parameters"].keys()),
-                },
-            }
-        )
-    return tool_descriptions
+        str: Output of the command execution
+    """
+    settings = project_settings()
+    bucket_name, region = settings.bucket_name(bucket_name), settings.region("gcs", region)
+    executor = get_executor()
+    if not confirm_action(executor.confirmation_heading, executor.describe_gcs_bucket(bucket_name, region)):
+        print("Command execution cancelled.")
+        return "Command execution cancelled.\n"
+    return executor.create_gcs_bucket(bucket_name, region)
+
+
+_client = None
+
+
+def get_client():
+    """Get the process-wide Anthropic client, creating it on first use."""
+    global _client
+    if _client is None:
+        _client = anthropic.Anthropic()
+    return _client
+
+
+def handle_request(user_prompt):
+    """
+    Turn one batch request into a tool call and run it.
+
+    Args:
+        user_prompt (str): Cloud storage bucket request
+
+    Returns:
+        dict: Tool call, its output (or the argument error), token usage and cost
+    """
+    response = get_client().messages.create(
+        model=MODEL,
+        max_tokens=1000,
+        temperature=0,
+        system=render_system_prompt(),
+        tools=TOOLS.descriptions(),
+        tool_choice={"type": "any"},
+        messages=[{"role": "user", "content": user_prompt}],
+    )
+    result = {
+        "input_tokens": response.usage.input_tokens,
+        "output_tokens": response.usage.output_tokens,
+        "cost": COST_LEDGER.record(MODEL, **anthropic_usage_tokens(response.usage)),
+    }
+    tool_use = next(content for content in response.content if content.type == "tool_use")
+    result.update(tool=tool_use.name, tool_input=tool_use.input)
+    try:
+        result["output"] = TOOLS.dispatch(tool_use.name, tool_use.input)
+    except ToolArgumentError as e:
+        result["error"] = str(e)
+    return result
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Create cloud storage buckets from natural language requests")
+    add_batch_arguments(parser)
+    args = parser.parse_args()
+
     # Check if ANTHROPIC_API_KEY is set
     if "ANTHROPIC_API_KEY" not in os.environ:
         print("Error: ANTHROPIC_API_KEY environment variable is not set")
         sys.exit(1)
+
+    # Reject a misconfigured executor before paying for a request
+    try:
+        get_executor()
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    if args.batch:
+        run_batch(handle_request, args.batch, args.workers, args.auto_approve, COST_LEDGER)
+        return
     
-    # Create Anthropic client
-    client = Anthropic()
+    # Import the SDK while the user is typing
+    anthropic.preload()
     
     # Get user input
     user_prompt = input("Enter your cloud storage bucket request: ")
+    
+    # Create Anthropic client
+    client = get_client()
     print("\nProcessing your request...")
 
-    # Send request to Anthropic API
+    # Stream the response and run the tool as soon as its input is complete
     start = time.time()
-    response = client.messages.create(
+    tool_started = False
+    tool_time = 0.0
+    with client.messages.stream(
         model=MODEL,
         max_tokens=1000,
         temperature=0,
         system=render_system_prompt(),
-        tools=get_tool_descriptions(),
+        tools=TOOLS.descriptions(),
         tool_choice={"type": "any"},
         messages=[{"role": "user", "content": user_prompt}],
-    )
-    end = time.time()
+    ) as stream:
+        for event in stream:
+            if event.type == "content_block_stop" and event.content_block.type == "tool_use" and not tool_started:
+                # Executors print their output as it is produced
+                tool_started = True
+                tool_start = time.time()
+                try:
+                    TOOLS.dispatch(event.content_block.name, event.content_block.input)
+                except ToolArgumentError as e:
+                    # Reject bad arguments before anything is confirmed or run
+                    print(f"Error: {e}")
+                tool_time += time.time() - tool_start
+        response = stream.get_final_message()
+    # Report LLM time only, excluding the confirmation prompt and execution
+    end = time.time() - tool_time
     
     # Get usage
     input_tokens = response.usage.input_tokens
-    input_cost = calculate_cost_by_tokens(input_tokens, MODEL, "input")
     output_tokens = response.usage.output_tokens
-    output_cost = calculate_cost_by_tokens(output_tokens, MODEL, "output")
-    print(f"Tokens: {input_tokens} sent, {output_tokens} recv, Cost: ${input_cost + output_cost:.4f}, Time: {end - start:.2f}s")
-
-    # Get the tool
-    result = ""
-    for content in response.content:
-        if content.type == "tool_use":
-            result = TOOLS[content.name]["function"](**content.input)
-            break
-
-    print(result)
+    cost = COST_LEDGER.record(MODEL, **anthropic_usage_tokens(response.usage))
+    print(f"Tokens: {input_tokens} sent, {output_tokens} recv, Cost: ${cost:.4f}, Time: {end - start:.2f}s")
 
 if __name__ == "__main__":
     main()
@@ -1,21 +1,46 @@
 #!/usr/bin/env python3
 
+import argparse
+import json
 import os
+import re
 import subprocess
 import sys
 import textwrap
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
 
-import boto3
-from botocore.exceptions import ClientError
-from anthropic import Anthropic
 from dotenv import load_dotenv
-from tokencost import calculate_cost_by_tokens
+
+from history import ConversationHistory
+
+# Modules shared between examples live in factor-01 and the repo root
+FACTOR_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [FACTOR_DIR, os.path.dirname(FACTOR_DIR)]
+from batch import add_batch_arguments, confirm, run_batch, set_auto_approve
+from lazy_imports import lazy_import
+from project_settings import project_settings
+from shared.pricing import CostLedger, anthropic_usage_tokens
+from tool_registry import ToolArgumentError, ToolRegistry
+
+# Imported on first use so the prompt appears without waiting for them
+anthropic = lazy_import("anthropic")
+boto3 = lazy_import("boto3")
+botocore_exceptions = lazy_import("botocore.exceptions")
+httpx = lazy_import("httpx")
 
 load_dotenv()
 
 MODEL = "claude-3-7-sonnet-20250219"
 
+# Running cost of every request in this session
+COST_LEDGER = CostLedger()
+
+# HTTP connection pool shared by every turn of the tool loop
+HTTP_LIMITS = {"max_connections": 10, "max_keepalive_connections": 5, "keepalive_expiry": 60}
+
 def render_system_prompt():
     return textwrap.dedent(f"""\
     You are an AWS S3 bucket management assistant. You help users create and validate S3 buckets using specialized tools.
@@ -24,6 +49,7 @@ def render_system_prompt():
 
     1. create_bucket(bucket_name, region)
        Creates an S3 bucket in AWS with the specified name and region.
+       Applies the project bucket prefix.
        This action requires confirmation before execution.
 
     2. is_valid_region(region)
@@ -31,17 +57,97 @@ def render_system_prompt():
        Returns true or false.
 
     3. bucket_exists(bucket_name, region)
-       Checks if an S3 bucket exists in the specified region.
+       Checks if an S3 bucket exists in the specified region, after applying the project bucket prefix.
        Returns true if the bucket exists, false otherwise.
 
+    4. create_buckets(buckets)
+       Creates several S3 buckets at once from a list of bucket_name/region specs.
+       Validates every region and checks existence itself, applies the project
+       bucket prefix, and returns a result for each bucket.
+       This action requires confirmation before execution.
+
     When handling bucket requests:
     - Always validate regions using is_valid_region before attempting to create buckets
     - Check if a bucket already exists using bucket_exists before attempting to create it
+    - Pass bucket names exactly as the user gave them; the tools apply the project bucket prefix
+    - When asked for more than one bucket, use create_buckets instead of validating and creating each one
+    - The request may include pre-fetched validation results; treat those checks as already done and don't call is_valid_region or bucket_exists again for the same arguments
 
     Guide users through the bucket creation process step by step, validating at each stage to prevent errors. If validation fails, explain specifically why and how to fix the issue.
     """)
 
 
+# Tools available to the LLM, registered below with @TOOLS.tool
+TOOLS = ToolRegistry()
+
+
+# Region catalog: loaded once per process and optionally persisted to disk
+REGION_CACHE_PATH = os.environ.get("AWS_REGION_CACHE_PATH")
+REGION_CACHE_TTL = 24 * 60 * 60  # seconds
+
+_region_index = None
+_region_index_lock = threading.Lock()
+
+
+def _load_region_index():
+    """
+    Load the S3 region catalog from the disk cache or botocore endpoint data.
+
+    Returns:
+        frozenset: Valid S3 region names
+    """
+    if REGION_CACHE_PATH:
+        try:
+            with open(REGION_CACHE_PATH, 'r') as file:
+                cached = json.load(file)
+            if time.time() - cached["loaded_at"] < REGION_CACHE_TTL:
+                return frozenset(cached["regions"])
+        except (OSError, ValueError, KeyError):
+            pass  # Missing, corrupt or stale cache: reload below
+
+    session = boto3.session.Session()
+    regions = frozenset(session.get_available_regions('s3'))
+
+    if REGION_CACHE_PATH:
+        try:
+            with open(REGION_CACHE_PATH, 'w') as file:
+                json.dump({"loaded_at": time.time(), "regions": sorted(regions)}, file)
+        except OSError:
+            pass  # The cache is an optimization, never fail validation over it
+    return regions
+
+
+def get_region_index():
+    """
+    Get the process-wide set of valid S3 regions, loading it on first use.
+
+    Returns:
+        frozenset: Valid S3 region names
+    """
+    global _region_index
+    if _region_index is None:
+        with _region_index_lock:
+            if _region_index is None:
+                _region_index = _load_region_index()
+    return _region_index
+
+
+def invalidate_region_index():
+    """Drop the in-memory and on-disk region catalog so the next lookup reloads it."""
+    global _region_index
+    with _region_index_lock:
+        _region_index = None
+        if REGION_CACHE_PATH:
+            try:
+                os.remove(REGION_CACHE_PATH)
+            except FileNotFoundError:
+                pass
+
+
+@TOOLS.tool(
+    "Checks if the provided region is a valid AWS region",
+    {"region": {"description": "The AWS region to check", "type": "string"}},
+)
 def is_valid_region(region):
     """
     Validate if the provided region is a valid AWS region
@@ -57,12 +163,8 @@ def is_valid_region(region):
         if region is None or not isinstance(region, str) or region.strip() == "":
             return "unprocessable region name"
         
-        # Get the list of available regions using boto3 session
-        session = boto3.session.Session()
-        valid_regions = session.get_available_regions('s3')
-        
-        # Check if the provided region is in the list of valid regions
-        is_valid = region in valid_regions
+        # Check if the provided region is in the cached set of valid regions
+        is_valid = region in get_region_index()
         
         if is_valid:
             return "valid region name"
@@ -72,29 +174,99 @@ def is_valid_region(region):
         return f"error validating region: {e}"
 
 
-def bucket_exists(bucket_name, region):
+# Regional S3 clients are expensive to create, keep the most recently used ones
+S3_CLIENT_CACHE_SIZE = 8
+
+_s3_clients = OrderedDict()
+_s3_clients_lock = threading.Lock()
+
+
+def get_s3_client(region):
     """
-    Check if an S3 bucket exists
-    
+    Get a cached S3 client for the region, creating it on first use.
+
+    boto3 clients are thread-safe, so one client per region is shared by
+    all S3 tools. The least recently used client is evicted once more than
+    S3_CLIENT_CACHE_SIZE regions are in use.
+
+    Args:
+        region (str): AWS region for the client
+
+    Returns:
+        S3 client for the region
+    """
+    with _s3_clients_lock:
+        if region in _s3_clients:
+            _s3_clients.move_to_end(region)
+            return _s3_clients[region]
+        # Creating a client is slow; hold the lock so concurrent tools
+        # don't build duplicate clients for the same region
+        client = boto3.client('s3', region_name=region)
+        _s3_clients[region] = client
+        if len(_s3_clients) > S3_CLIENT_CACHE_SIZE:
+            _s3_clients.popitem(last=False)
+        return client
+
+
+# bucket_exists results keyed by (bucket_name, region); errors are never cached
+BUCKET_EXISTS_CACHE_TTL = 300  # seconds
+
+_bucket_exists_cache = {}
+_bucket_exists_lock = threading.Lock()
+_bucket_exists_stats = {"hits": 0, "misses": 0}
+
+
+def bucket_exists_cache_stats():
+    """
+    Get hit/miss statistics for the bucket existence cache.
+
+    Returns:
+        dict: hits, misses, hit_rate and number of cached entries
+    """
+    with _bucket_exists_lock:
+        lookups = _bucket_exists_stats["hits"] + _bucket_exists_stats["misses"]
+        return {
+            "hits": _bucket_exists_stats["hits"],
+            "misses": _bucket_exists_stats["misses"],
+            "hit_rate": _bucket_exists_stats["hits"] / lookups if lookups else 0.0,
+            "size": len(_bucket_exists_cache),
+        }
+
+
+def invalidate_bucket_exists(bucket_name):
+    """
+    Drop cached existence results for a bucket in every region.
+
+    Bucket names are global, so creating a bucket in one region changes
+    the answer for all of them.
+
+    Args:
+        bucket_name (str): Name of the S3 bucket
+    """
+    with _bucket_exists_lock:
+        for key in [key for key in _bucket_exists_cache if key[0] == bucket_name]:
+            del _bucket_exists_cache[key]
+
+
+def _head_bucket(bucket_name, region):
+    """
+    Check if an S3 bucket exists by calling head_bucket.
+
     Args:
         bucket_name (str): Name of the S3 bucket to check
         region (str): AWS region where the bucket should exist
-        
+
     Returns:
         str: A string indicating whether the bucket exists or not
     """
     try:
-        # Basic sanity checks for bucket name
-        if bucket_name is None or not isinstance(bucket_name, str) or bucket_name.strip() == "":
-            return "invalid bucket name"
-            
-        # Create a boto3 client for S3 in the specified region
-        s3_client = boto3.client('s3', region_name=region)
+        # Get the shared S3 client for the specified region
+        s3_client = get_s3_client(region)
         
         # Check if the bucket exists by calling head_bucket
         s3_client.head_bucket(Bucket=bucket_name)
         return "bucket exists"
-    except ClientError as e:
+    except botocore_exceptions.ClientError as e:
         error_code = e.response.get('Error', {}).get('Code', '')
         
         # 404 means bucket doesn't exist, which is fine
@@ -105,16 +277,73 @@ def bucket_exists(bucket_name, region):
         return f"error checking bucket existence: {e}"
 
 
+@TOOLS.tool(
+    "Checks if an S3 bucket exists in the specified region",
+    {
+        "bucket_name": {"description": "The name of the S3 bucket to check", "type": "string"},
+        "region": {"description": "The AWS region where the bucket should exist", "type": "string"},
+    },
+)
+def bucket_exists(bucket_name, region):
+    """
+    Check if an S3 bucket exists
+    
+    Definitive answers are cached for BUCKET_EXISTS_CACHE_TTL seconds, so
+    retries and bulk runs don't repeat the same HEAD request.
+    
+    Args:
+        bucket_name (str): Name of the S3 bucket to check
+        region (str): AWS region where the bucket should exist
+        
+    Returns:
+        str: A string indicating whether the bucket exists or not
+    """
+    # Basic sanity checks for bucket name
+    if bucket_name is None or not isinstance(bucket_name, str) or bucket_name.strip() == "":
+        return "invalid bucket name"
+    # Check the name create_bucket will actually use
+    bucket_name = project_settings().bucket_name(bucket_name)
+
+    key = (bucket_name, region)
+    with _bucket_exists_lock:
+        cached = _bucket_exists_cache.get(key)
+        if cached and time.monotonic() - cached[1] < BUCKET_EXISTS_CACHE_TTL:
+            _bucket_exists_stats["hits"] += 1
+            return cached[0]
+        _bucket_exists_stats["misses"] += 1
+
+    result = _head_bucket(bucket_name, region)
+    if result in ("bucket exists", "bucket does not exist"):
+        with _bucket_exists_lock:
+            _bucket_exists_cache[key] = (result, time.monotonic())
+    return result
+
+
+@TOOLS.tool(
+    "Creates an S3 bucket in AWS with the specified name and region",
+    {
+        "bucket_name": {"description": "The name of the S3 bucket to create", "type": "string"},
+        "region": {"description": "The AWS region where the S3 bucket will be created", "type": "string"},
+    },
+    requires_confirmation=True,
+)
 def create_bucket(bucket_name, region):
     """
     Create an S3 bucket in AWS with the specified name and region.
 
+    The project prefix from PROJECT.md is applied, as in create_buckets.
+
     Args:
         bucket_name (str): Name of the S3 bucket to create
         region (str): AWS region where the S3 bucket will be created
+
+    Returns:
+        str: The created bucket and region
     """
-    # Create a boto3 client for S3 in the specified region
-    s3_client = boto3.client('s3', region_name=region)
+    bucket_name = project_settings().bucket_name(bucket_name)
+
+    # Get the shared S3 client for the specified region
+    s3_client = get_s3_client(region)
     
     # Create the S3 bucket
     if region == "us-east-1":
@@ -124,166 +353,515 @@ def create_bucket(bucket_name, region):
             Bucket=bucket_name,
             CreateBucketConfiguration={'LocationConstraint': region}
         )
+    invalidate_bucket_exists(bucket_name)
+    return f"created bucket {bucket_name} in {region}"
 
-TOOLS = {
-    "create_bucket": {
-        "name": "create_bucket",
-        "function": create_bucket,
-        "description": "Creates an S3 bucket in AWS with the specified name and region",
-        "parameters": {
-            "bucket_name": {
-                "description": "The name of the S3 bucket to create",
-                "type": "string",
-            },
-            "region": {
-                "description": "The AWS region where the S3 bucket will be created",
-                "type": "string",
-            },
-        },
-        "requires_confirmation": True,
-    },
-    "is_valid_region": {
-        "name": "is_valid_region",
-        "function": is_valid_region,
-        "description": "Checks if the provided region is a valid AWS region",
-        "parameters": {
-            "region": {
-                "description": "The AWS region to check",
-                "type": "string",
-            },
-        },
-        "requires_confirmation": False,
-    },
-    "bucket_exists": {
-        "name": "bucket_exists",
-        "function": bucket_exists,
-        "description": "Checks if an S3 bucket exists in the specified region",
-        "parameters": {
-            "bucket_name": {
-                "description": "The name of the S3 bucket to check",
-                "type": "string",
-            },
-            "region": {
-                "description": "The AWS region where the bucket should exist",
-                "type": "string",
+
+# Upper bound on concurrent S3 calls during bulk provisioning
+BULK_MAX_WORKERS = 8
+
+
+@TOOLS.tool(
+    "Creates several S3 buckets at once, validating regions and existence for the whole batch",
+    {
+        "buckets": {
+            "description": "The buckets to create",
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "bucket_name": {"type": "string", "description": "The name of the S3 bucket to create"},
+                    "region": {"type": "string", "description": "The AWS region where the S3 bucket will be created"},
+                },
+                "required": ["bucket_name", "region"],
             },
         },
-        "requires_confirmation": False,
     },
-}
+    requires_confirmation=True,
+)
+def create_buckets(buckets):
+    """
+    Create several S3 buckets concurrently.
+
+    Regions are validated and existence is checked for the whole batch
+    before anything is created. Buckets that pass are created with at most
+    BULK_MAX_WORKERS requests in flight, using create_bucket.
 
+    Args:
+        buckets (list): Dicts with bucket_name and region keys
+
+    Returns:
+        str: JSON list with one {bucket_name, region, status, detail} result per spec
+    """
+    settings = project_settings()
+    results = []
+    seen = set()
+    for spec in buckets:
+        bucket_name = spec.get("bucket_name") if isinstance(spec, dict) else None
+        region = spec.get("region") if isinstance(spec, dict) else None
+        result = {"bucket_name": bucket_name, "region": region, "status": "pending", "detail": ""}
+        if not isinstance(bucket_name, str) or bucket_name.strip() == "":
+            result.update(status="invalid", detail="invalid bucket name")
+        else:
+            result["bucket_name"] = settings.bucket_name(bucket_name.strip())
+            if is_valid_region(region) != "valid region name":
+                result.update(status="invalid", detail="invalid region name")
+            elif result["bucket_name"] in seen:
+                result.update(status="skipped", detail="duplicate bucket name in request")
+            else:
+                seen.add(result["bucket_name"])
+        results.append(result)
+
+    pending = [result for result in results if result["status"] == "pending"]
+    if not pending:
+        return json.dumps(results, indent=2)
+
+    with ThreadPoolExecutor(max_workers=min(BULK_MAX_WORKERS, len(pending))) as executor:
+        existence = executor.map(lambda r: bucket_exists(r["bucket_name"], r["region"]), pending)
+        for result, status in zip(pending, existence):
+            if status == "bucket exists":
+                result.update(status="exists", detail=status)
+            elif status != "bucket does not exist":
+                result.update(status="error", detail=status)
+
+        to_create = [result for result in pending if result["status"] == "pending"]
+
+        def create(result):
+            try:
+                create_bucket(result["bucket_name"], result["region"])
+                result.update(status="created", detail="bucket created")
+            except Exception as e:
+                result.update(status="error", detail=f"error creating bucket: {e}")
+
+        list(executor.map(create, to_create))
+
+    return json.dumps(results, indent=2)
+
+
+# The system prompt and tool schemas don't change between turns, build them once
+SYSTEM_PROMPT = render_system_prompt()
+TOOL_DESCRIPTIONS = TOOLS.descriptions()
+# Cache breakpoint after the stable prefix (tools, then system prompt)
+SYSTEM_BLOCKS = [{"type": "text", "text": SYSTEM_PROMPT, "cache_control": {"type": "ephemeral"}}]
+
+_client = None
+
+# Threads for running independent tool calls from the same turn concurrently
+TOOL_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="tool")
 
-def get_tool_descriptions():
-    """Get descriptions of available tools in a format suitable for LLM tool calling.
+
+def get_client():
+    """
+    Get the process-wide Anthropic client, creating it on first use.
+
+    Reusing one client keeps HTTP keep-alive connections and TLS sessions
+    open across turns of the tool loop.
 
     Returns:
-        List of tool descriptions compatible with LLM tool calling format
-    """
-    tool_descriptions = []
-    for tool_name, tool_info in TOOLS.items():
-        properties = {
-            param_name: {
-                "type": param_info["type"],
-                "description": param_info["description"],
-            }
-            for param_name, param_info in tool_info["parameters"].items()
-        }
-        tool_descriptions.append(
-            {
-                "type": "custom",
-                "name": tool_name,
-                "description": tool_info["description"],
-                "input_schema": {
-                    "type": "object",
-                    "properties": properties,
-                    "required": list(tool_info["parameters"].keys()),
-                },
-            }
-        )
-    return tool_descriptions
+        Anthropic: Shared Anthropic client
+    """
+    global _client
+    if _client is None:
+        # Check if ANTHROPIC_API_KEY is set
+        if "ANTHROPIC_API_KEY" not in os.environ:
+            print("Error: ANTHROPIC_API_KEY environment variable is not set")
+            sys.exit(1)
+        _client = anthropic.Anthropic(http_client=anthropic.DefaultHttpxClient(limits=httpx.Limits(**HTTP_LIMITS)))
+    return _client
 
 
-def llm_request(messages):
+def llm_request(messages, on_tool_use=None):
     """
-    Send a request to the Anthropic API and handle the response.
+    Stream a request to the Anthropic API and handle the response.
+
+    Text is printed as it arrives. The SDK assembles each tool_use block's
+    input from the streamed JSON deltas; on_tool_use is called as soon as a
+    block is complete, before the rest of the message has arrived.
+
+    The tools and system prompt end in a prompt cache breakpoint; messages
+    from ConversationHistory.request_messages() add one on the latest
+    message, so the next turn reads the whole history so far from cache.
 
     Args:
         messages (list): List of messages to send to the LLM
+        on_tool_use (callable): Called with each completed tool_use block
 
     Returns:
-        response: The response from the LLM
+        tuple: (response from the LLM, cost of the request in USD)
     """
-
-    # Check if ANTHROPIC_API_KEY is set
-    if "ANTHROPIC_API_KEY" not in os.environ:
-        print("Error: ANTHROPIC_API_KEY environment variable is not set")
-        sys.exit(1)
-    
-    # Create Anthropic client
-    client = Anthropic()
-    
     # Send request to Anthropic API
     start = time.time()
-    response = client.messages.create(
+    printed_text = False
+    with get_client().messages.stream(
         model=MODEL,
         max_tokens=1000,
         temperature=0,
-        system=render_system_prompt(),
-        tools=get_tool_descriptions(),
+        system=SYSTEM_BLOCKS,
+        tools=TOOL_DESCRIPTIONS,
         tool_choice={"type": "auto"},
         messages=messages,
-    )
+    ) as stream:
+        for event in stream:
+            if event.type == "text":
+                if not printed_text:
+                    print()
+                    printed_text = True
+                print(event.text, end="", flush=True)
+            elif event.type == "content_block_stop" and event.content_block.type == "tool_use" and on_tool_use:
+                on_tool_use(event.content_block)
+        response = stream.get_final_message()
     end = time.time()
+    if printed_text:
+        print()
     
     # Get usage
     input_tokens = response.usage.input_tokens
-    input_cost = calculate_cost_by_tokens(input_tokens, MODEL, "input")
     output_tokens = response.usage.output_tokens
-    output_cost = calculate_cost_by_tokens(output_tokens, MODEL, "output")
-    print(f"Tokens: {input_tokens} sent, {output_tokens} recv, Cost: ${input_cost + output_cost:.4f}, Time: {end - start:.2f}s")
+    cached_tokens = response.usage.cache_read_input_tokens or 0
+    cost = COST_LEDGER.record(MODEL, **anthropic_usage_tokens(response.usage))
+    print(f"Tokens: {input_tokens} sent, {cached_tokens} cached, {output_tokens} recv, Cost: ${cost:.4f}, Time: {end - start:.2f}s")
 
-    return response
+    return response, cost
 
 
-def main():
-    user_prompt = input("Enter your cloud storage bucket request: ")
-    messages = [{"role": "user", "content": user_prompt}]
-    print("\nProcessing your request...")
+def format_tool_call(tool_use):
+    """
+    Format a tool_use block as a readable function call.
+
+    Args:
+        tool_use: tool_use content block from the LLM response
+
+    Returns:
+        str: e.g. "bucket_exists(bucket_name='logs', region='us-west-2')"
+    """
+    formatted_input = ", ".join(
+        f"{k}='{v}'" for k, v in tool_use.input.items()
+    )
+    return f"{tool_use.name}({formatted_input})"
+
+
+def execute_tool(tool_use):
+    """
+    Execute a tool_use block and wrap the outcome as a tool_result block.
+
+    Args:
+        tool_use: tool_use content block from the LLM response
+
+    Returns:
+        dict: tool_result block for the next user message
+    """
+    print(f"\nExecuting: {format_tool_call(tool_use)}")
+    try:
+        result = TOOLS.dispatch(tool_use.name, tool_use.input)
+    except ToolArgumentError as e:
+        return invalid_tool_result(tool_use, e)
+    except Exception as e:
+        return {
+            "type": "tool_result",
+            "tool_use_id": tool_use.id,
+            "content": f"error executing {tool_use.name}: {e}",
+            "is_error": True,
+        }
+    return {
+        "type": "tool_result",
+        "tool_use_id": tool_use.id,
+        "content": str(result),
+    }
+
+
+def invalid_tool_result(tool_use, error):
+    """
+    Build the tool_result for a call whose arguments failed validation.
+
+    Args:
+        tool_use: tool_use content block from the LLM response
+        error (ToolArgumentError): The validation error
+
+    Returns:
+        dict: tool_result block for the next user message
+    """
+    print(f"\nRejected: {error}")
+    return {
+        "type": "tool_result",
+        "tool_use_id": tool_use.id,
+        "content": str(error),
+        "is_error": True,
+    }
+
+
+def validate_tool_use(tool_use):
+    """
+    Check a tool_use block against its tool's schema.
+
+    Returns:
+        ToolArgumentError or None: The error if the call is invalid
+    """
+    try:
+        TOOLS.validate(tool_use.name, tool_use.input)
+    except ToolArgumentError as e:
+        return e
+    return None
+
+
+def start_tool(tool_use, started):
+    """
+    Start a tool that doesn't need confirmation in the background.
+
+    Args:
+        tool_use: tool_use content block from the LLM response
+        started (dict): tool_use id to Future, updated in place
+    """
+    if tool_use.id in started or validate_tool_use(tool_use):
+        return
+    if not TOOLS[tool_use.name].requires_confirmation:
+        started[tool_use.id] = TOOL_EXECUTOR.submit(execute_tool, tool_use)
+
+
+def process_tool_uses(tool_uses, started=None):
+    """
+    Run all tool calls from one LLM turn and collect their results.
+
+    Arguments are validated first; invalid calls are answered with an error
+    without asking for confirmation. Confirmations are gathered up front. Tools that don't need confirmation
+    run concurrently (some may already have been started while the response
+    was streaming), so a turn costs the slowest tool rather than the sum.
+    Confirmed tools run afterwards, so checks requested in the same turn
+    finish before anything is changed. Declined tools are reported back to
+    the LLM instead of ending the conversation.
+
+    Args:
+        tool_uses (list): tool_use content blocks from the LLM response
+        started (dict): tool_use id to Future for tools already running
+
+    Returns:
+        list: tool_result blocks in the same order as tool_uses
+    """
+    results = {}
+    started = dict(started or {})
+    confirmed_tools = []
+    for tool_use in tool_uses:
+        error = validate_tool_use(tool_use)
+        if error:
+            results[tool_use.id] = invalid_tool_result(tool_use, error)
+            continue
+        if not TOOLS[tool_use.name].requires_confirmation:
+            start_tool(tool_use, started)
+            continue
+        if confirm(f"\nConfirm {format_tool_call(tool_use)}? (y/n): "):
+            confirmed_tools.append(tool_use)
+        else:
+            print("Tool execution cancelled.")
+            results[tool_use.id] = {
+                "type": "tool_result",
+                "tool_use_id": tool_use.id,
+                "content": "Tool execution cancelled by the user.",
+                "is_error": True,
+            }
+
+    for tool_use_id, future in started.items():
+        results[tool_use_id] = future.result()
+    for tool_use in confirmed_tools:
+        results[tool_use.id] = execute_tool(tool_use)
+
+    return [results[tool_use.id] for tool_use in tool_uses]
+
+
+def bulk_main(spec_file, auto_approve=False):
+    """
+    Create buckets from a JSON file of bucket specs without the LLM.
+
+    Args:
+        spec_file (str): Path to a JSON list of {bucket_name, region} specs, or "-" for stdin
+        auto_approve (bool): Approve the confirmation instead of asking
+    """
+    if spec_file == "-":
+        buckets = json.load(sys.stdin)
+    else:
+        with open(spec_file, 'r') as file:
+            buckets = json.load(file)
+
+    if auto_approve:
+        set_auto_approve(True)
+    if not confirm(f"Create {len(buckets)} buckets? (y/n): "):
+        print("Bulk creation cancelled.")
+        return
+
+    start = time.time()
+    results = json.loads(create_buckets(buckets))
+    end = time.time()
+
+    for result in results:
+        print(f"{result['status']:<8} {str(result['bucket_name']):<45} {str(result['region']):<15} {result['detail']}")
+    created = sum(1 for result in results if result["status"] == "created")
+    print(f"\n{created}/{len(results)} buckets created in {end - start:.2f}s")
+    print_bucket_exists_cache_stats()
+
+
+def print_bucket_exists_cache_stats():
+    """Print hit/miss statistics for the bucket existence cache."""
+    stats = bucket_exists_cache_stats()
+    print(f"bucket_exists cache: {stats['hits']} hits, {stats['misses']} misses ({stats['hit_rate']:.0%} hit rate)")
+
+
+# Speculative validation of regions and bucket names found in the request
+PREFETCH_WAIT = 1.0  # seconds to wait for results before the first LLM call
+PREFETCH_MAX_BUCKETS = 5
+REGION_PATTERN = re.compile(r"\b[a-z]{2}(?:-gov)?-[a-z]+-\d\b")
+BUCKET_NAME_PATTERN = re.compile(
+    r"""(?:\b(?:named|called)\s+["'`]?|["'`])([a-z0-9][a-z0-9.-]{1,61}[a-z0-9])\b"""
+)
+
+
+def extract_validation_candidates(user_prompt):
+    """
+    Find regions and bucket names mentioned in a request.
+
+    Args:
+        user_prompt (str): Cloud storage bucket request
+
+    Returns:
+        tuple: (regions, bucket names), each deduplicated in order of appearance
+    """
+    regions = list(dict.fromkeys(REGION_PATTERN.findall(user_prompt)))
+    bucket_names = [
+        name for name in dict.fromkeys(BUCKET_NAME_PATTERN.findall(user_prompt)) if name not in regions
+    ]
+    return regions, bucket_names[:PREFETCH_MAX_BUCKETS]
+
+
+def _prefetch_bucket_exists(bucket_name, region):
+    """Run bucket_exists only if the region is valid; returns None otherwise."""
+    if region not in get_region_index():
+        return None
+    return bucket_exists(bucket_name, region)
+
+
+def prefetch_validations(user_prompt):
+    """
+    Start is_valid_region and bucket_exists checks for a request.
+
+    Every bucket name is checked in every valid region found; nothing is
+    checked for buckets if the request names no region.
+
+    Args:
+        user_prompt (str): Cloud storage bucket request
+
+    Returns:
+        dict: Formatted tool call to Future
+    """
+    regions, bucket_names = extract_validation_candidates(user_prompt)
+    futures = {}
+    for region in regions:
+        futures[f"is_valid_region(region='{region}')"] = TOOL_EXECUTOR.submit(is_valid_region, region)
+        for bucket_name in bucket_names:
+            call = f"bucket_exists(bucket_name='{bucket_name}', region='{region}')"
+            futures[call] = TOOL_EXECUTOR.submit(_prefetch_bucket_exists, bucket_name, region)
+    return futures
+
+
+def with_prefetched_validations(user_prompt, futures, timeout=PREFETCH_WAIT):
+    """
+    Append finished pre-fetched validation results to a request.
+
+    Checks still running after the timeout are left out; the LLM can call
+    those tools itself.
+
+    Args:
+        user_prompt (str): Cloud storage bucket request
+        futures (dict): Formatted tool call to Future, from prefetch_validations
+        timeout (float): Seconds to wait for the checks
+
+    Returns:
+        str: The request, followed by the results if there are any
+    """
+    if not futures:
+        return user_prompt
+    wait(futures.values(), timeout=timeout)
+    lines = [
+        f"- {call} -> {future.result()}"
+        for call, future in futures.items()
+        if future.done() and future.exception() is None and future.result() is not None
+    ]
+    print(f"Pre-fetched {len(lines)} validation results")
+    if not lines:
+        return user_prompt
+    return user_prompt + "\n\n<prefetched_validation>\n" + "\n".join(lines) + "\n</prefetched_validation>"
+
+
+def run_agent(user_prompt):
+    """
+    Run the tool loop for one request until the LLM gives a final answer.
+
+    Args:
+        user_prompt (str): Cloud storage bucket request
+
+    Returns:
+        dict: Final answer, number of turns, token usage and cost of the request
+    """
+    # Validate what the request mentions while the client warms up, so the
+    # first turn can go straight to create_bucket
+    futures = prefetch_validations(user_prompt)
+    get_client()
+    history = ConversationHistory()
+    history.append({"role": "user", "content": with_prefetched_validations(user_prompt, futures)})
+    totals = {"turns": 0, "input_tokens": 0, "output_tokens": 0, "cost": 0.0}
 
     while True:
-        response = llm_request(messages)
-        messages.append({"role": "assistant", "content": response.content})
+        totals["turns"] += 1
+        collapsed = history.compact()
+        if collapsed:
+            print(f"History: collapsed {collapsed} earlier tool exchanges into a summary")
+        print(f"Turn {totals['turns']}: {len(history.messages)} messages, ~{history.estimated_tokens()} history tokens")
+
+        # Read-only tools start while the rest of the response is streaming
+        started = {}
+        response, cost = llm_request(history.request_messages(), on_tool_use=lambda tool_use: start_tool(tool_use, started))
+        totals["input_tokens"] += response.usage.input_tokens
+        totals["output_tokens"] += response.usage.output_tokens
+        totals["cost"] += cost
+        history.append({"role": "assistant", "content": response.content})
 
         if(response.stop_reason == "tool_use"):
-            tool_results = []
-            for content in response.content:
-                if content.type == "tool_use":
-                    tool = TOOLS[content.name]
-                    formatted_input = ", ".join(
-                        f"{k}='{v}'" for k, v in content.input.items()
-                    )
-                    formatted_tool = f"{content.name}({formatted_input})"
-                    if tool["requires_confirmation"]:
-                        confirmation = input(f"\nConfirm {formatted_tool}? (y/n): ").lower()
-                        if confirmation not in ('y', 'yes'):
-                            print("Tool execution cancelled.")
-                            break
-                    print(f"\nExecuting: {formatted_tool}")
-                    result = tool["function"](**content.input)
-                    tool_results.append({
-                      "type": "tool_result",
-                      "tool_use_id": content.id,
-                      "content": str(result),
-                    })
-            if not tool_results:
+            tool_uses = [content for content in response.content if content.type == "tool_use"]
+            if not tool_uses:
                 print("No tool results to process.")
                 break
-            messages.append({"role": "user", "content": tool_results})
+            # All tool_result blocks go back in a single message
+            history.append({"role": "user", "content": process_tool_uses(tool_uses, started)})
             print("\nProcessing tool results...")
         else:
-            print("\nResponse:")
-            print(response.content[0].text)
+            # The final answer was already printed while streaming
             break
 
+    totals["answer"] = "".join(content.text for content in response.content if content.type == "text")
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AWS S3 bucket management assistant")
+    parser.add_argument("--bulk", metavar="SPEC_FILE", help="Create buckets from a JSON list of {bucket_name, region} specs (- for stdin)")
+    add_batch_arguments(parser)
+    args = parser.parse_args()
+
+    if args.bulk:
+        bulk_main(args.bulk, args.auto_approve)
+        return
+
+    if args.batch:
+        get_client()  # fail fast on a missing API key
+        run_batch(run_agent, args.batch, args.workers, args.auto_approve, COST_LEDGER)
+        return
+
+    # Import the SDKs while the user is typing
+    for module in (anthropic, boto3):
+        module.preload()
+
+    user_prompt = input("Enter your cloud storage bucket request: ")
+    print("\nProcessing your request...")
+    run_agent(user_prompt)
+
+    print_bucket_exists_cache_stats()
+    print(f"Session cost: ${COST_LEDGER.total:.4f}")
+
 if __name__ == "__main__":
     main()
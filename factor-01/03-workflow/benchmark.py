@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+
+import argparse
+import json
+import os
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import boto3
+from anthropic import Anthropic
+
+# Benchmarks never talk to real services
+os.environ.setdefault("ANTHROPIC_API_KEY", "benchmark")
+
+import aws_tools
+
+CANNED_MESSAGE = {
+    "id": "msg_benchmark",
+    "type": "message",
+    "role": "assistant",
+    "model": aws_tools.MODEL,
+    "content": [{"type": "text", "text": "ok"}],
+    "stop_reason": "end_turn",
+    "stop_sequence": None,
+    "usage": {"input_tokens": 500, "output_tokens": 1},
+}
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Minimal Messages API stand-in that answers every POST with a canned message"""
+
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        body = json.dumps(CANNED_MESSAGE).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stand_in_server():
+    """
+    Start the stand-in server on a free local port.
+
+    Returns:
+        tuple: (server, base_url)
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+def timed(func, iterations):
+    """
+    Call func repeatedly and collect per-call latencies.
+
+    Returns:
+        list: Latency of each call in milliseconds
+    """
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def report(name, latencies):
+    print(f"{name:<40} median {statistics.median(latencies):10.4f} ms  mean {statistics.mean(latencies):10.4f} ms  n={len(latencies)}")
+
+
+def bench_llm_client(iterations):
+    """Per-turn latency with a fresh client and prompt vs the pooled client"""
+    server, base_url = start_stand_in_server()
+    messages = [{"role": "user", "content": "Create a bucket named logs-archive in us-west-2"}]
+
+    def fresh_client_turn():
+        client = Anthropic(base_url=base_url)
+        client.messages.create(
+            model=aws_tools.MODEL,
+            max_tokens=1000,
+            temperature=0,
+            system=aws_tools.render_system_prompt(),
+            tools=aws_tools.TOOLS.descriptions(),
+            tool_choice={"type": "auto"},
+            messages=messages,
+        )
+
+    pooled_client = aws_tools.get_client().with_options(base_url=base_url)
+
+    def pooled_client_turn():
+        pooled_client.messages.create(
+            model=aws_tools.MODEL,
+            max_tokens=1000,
+            temperature=0,
+            system=aws_tools.SYSTEM_PROMPT,
+            tools=aws_tools.TOOL_DESCRIPTIONS,
+            tool_choice={"type": "auto"},
+            messages=messages,
+        )
+
+    print("\nLLM client per-turn latency (local stand-in server)")
+    report("fresh client + prompt per turn", timed(fresh_client_turn, iterations))
+    report("pooled client + prebuilt prompt", timed(pooled_client_turn, iterations))
+    server.shutdown()
+
+
+def bench_regions(iterations):
+    """is_valid_region with a fresh botocore session per call vs the cached region index"""
+
+    def session_per_call():
+        "us-west-2" in boto3.session.Session().get_available_regions('s3')
+
+    aws_tools.invalidate_region_index()
+    cold = timed(lambda: aws_tools.get_region_index(), 1)
+
+    print("\nRegion validation latency")
+    report("session per call (previous behavior)", timed(session_per_call, iterations))
+    report("cached index, first load", cold)
+    report("cached index, is_valid_region", timed(lambda: aws_tools.is_valid_region("us-west-2"), iterations))
+
+
+def bench_s3_clients(iterations):
+    """head_bucket with a new S3 client per call vs the regional client cache and existence cache (requires moto)"""
+    from moto import mock_aws
+
+    for name in ("AWS_ACCESS_KEY_ID", "AWS_SECRET_ACCESS_KEY"):
+        os.environ.setdefault(name, "benchmark")
+
+    with mock_aws():
+        aws_tools.create_bucket("benchmark-bucket", "us-west-2")
+        # create_bucket applies the project prefix
+        bucket_name = aws_tools.project_settings().bucket_name("benchmark-bucket")
+
+        def client_per_call():
+            boto3.client('s3', region_name="us-west-2").head_bucket(Bucket=bucket_name)
+
+        print("\nbucket_exists latency (moto S3 stand-in)")
+        report("client per call (previous behavior)", timed(client_per_call, iterations))
+        report("regional client cache", timed(lambda: aws_tools._head_bucket(bucket_name, "us-west-2"), iterations))
+        report("existence cache", timed(lambda: aws_tools.bucket_exists("benchmark-bucket", "us-west-2"), iterations))
+
+
+BENCHMARKS = {
+    "llm-client": bench_llm_client,
+    "regions": bench_regions,
+    "s3-clients": bench_s3_clients,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmarks for the AWS tools workflow")
+    parser.add_argument("benchmarks", nargs="*", help=f"Benchmarks to run: {', '.join(BENCHMARKS)} (default: all)")
+    parser.add_argument("-n", "--iterations", type=int, default=50, help="Iterations per measurement")
+    args = parser.parse_args()
+
+    unknown = set(args.benchmarks) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(sorted(unknown))}")
+
+    for name in args.benchmarks or BENCHMARKS:
+        BENCHMARKS[name](args.iterations)
+
+
+if __name__ == "__main__":
+    main()
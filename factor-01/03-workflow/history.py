@@ -0,0 +1,170 @@
+import json
+
+# Input-token budget for the message history (system prompt and tools excluded)
+HISTORY_TOKEN_BUDGET = 8000
+# Rough characters-per-token ratio for estimating messages not yet sent
+CHARS_PER_TOKEN = 4
+# Longest tool result kept in a summary line
+SUMMARY_RESULT_CHARS = 200
+# Largest share of the budget the summary may use; older lines are rolled
+# into a count of omitted calls
+SUMMARY_BUDGET_FRACTION = 0.25
+
+
+def _block_dict(block):
+    """Return a content block as a plain dict (SDK blocks are pydantic models)."""
+    return block if isinstance(block, dict) else block.model_dump(exclude_none=True)
+
+
+def _content_blocks(message):
+    """Return a message's content as a list of block dicts."""
+    content = message["content"]
+    if isinstance(content, str):
+        return [{"type": "text", "text": content}]
+    return [_block_dict(block) for block in content]
+
+
+def estimate_tokens(messages):
+    """
+    Estimate the input tokens used by a list of messages.
+
+    Args:
+        messages (list): Messages in Anthropic format
+
+    Returns:
+        int: Approximate token count
+    """
+    chars = sum(len(json.dumps(_content_blocks(message), default=str)) for message in messages)
+    return chars // CHARS_PER_TOKEN
+
+
+class ConversationHistory:
+    """
+    Message history for the agent loop, kept under a token budget.
+
+    Once the history grows past the budget, resolved tool exchanges (an
+    assistant tool_use message and the user tool_result message answering
+    it) are collapsed into a single summary pair right after the first user
+    message, oldest first, down to half the budget so compaction happens
+    rarely. The latest exchange, answering the pending tool calls, always
+    stays verbatim. The summary is capped at SUMMARY_BUDGET_FRACTION of the
+    budget, with the oldest lines rolled up into a count.
+
+    Between compactions messages are only appended, so with the cache
+    breakpoint from request_messages() each turn reads the previous turn's
+    prefix from the prompt cache; only a compaction turn writes it anew.
+    """
+
+    def __init__(self, token_budget=HISTORY_TOKEN_BUDGET):
+        self.token_budget = token_budget
+        self.messages = []
+        self._summary_end = 1  # index after the first prompt and any summary pair
+        self._summary_lines = []
+        self._omitted_calls = 0
+
+    def append(self, message):
+        self.messages.append(message)
+
+    def estimated_tokens(self):
+        return estimate_tokens(self.messages)
+
+    def request_messages(self):
+        """
+        Messages to send, with a prompt cache breakpoint on the last block.
+
+        The stored history is not modified.
+
+        Returns:
+            list: Messages in Anthropic format
+        """
+        if not self.messages:
+            return []
+        last = self.messages[-1]
+        blocks = [dict(block) for block in _content_blocks(last)]
+        blocks[-1]["cache_control"] = {"type": "ephemeral"}
+        return self.messages[:-1] + [{"role": last["role"], "content": blocks}]
+
+    def _exchanges(self):
+        """
+        Find tool exchanges after the summarized prefix.
+
+        Returns:
+            list: Start indices of (assistant tool_use, user tool_result) pairs
+        """
+        starts = []
+        index = self._summary_end
+        while index + 1 < len(self.messages):
+            assistant, user = self.messages[index], self.messages[index + 1]
+            if (
+                assistant["role"] == "assistant"
+                and any(block["type"] == "tool_use" for block in _content_blocks(assistant))
+                and user["role"] == "user"
+                and all(block["type"] == "tool_result" for block in _content_blocks(user))
+            ):
+                starts.append(index)
+                index += 2
+            else:
+                break
+        return starts
+
+    def _summarize(self, messages):
+        """Summarize tool exchanges as one line per call: tool(args) -> result."""
+        results = {}
+        for message in messages:
+            for block in _content_blocks(message):
+                if block["type"] == "tool_result":
+                    content = block["content"] if isinstance(block["content"], str) else json.dumps(block["content"])
+                    results[block["tool_use_id"]] = content[:SUMMARY_RESULT_CHARS]
+        lines = []
+        for message in messages:
+            for block in _content_blocks(message):
+                if block["type"] == "tool_use":
+                    args = ", ".join(f"{k}={v!r}" for k, v in block["input"].items())
+                    lines.append(f"- {block['name']}({args}) -> {results.get(block['id'], 'no result')}")
+        return lines
+
+    def _summary_messages(self):
+        """Build the summary pair, dropping the oldest lines until it fits its share of the budget."""
+        summary_budget = int(self.token_budget * SUMMARY_BUDGET_FRACTION)
+        while True:
+            header = ["Summary of earlier tool calls:"]
+            if self._omitted_calls:
+                header.append(f"- ({self._omitted_calls} earlier tool calls omitted)")
+            summary = [
+                {"role": "assistant", "content": "\n".join(header + self._summary_lines)},
+                {"role": "user", "content": "(Earlier tool results are summarized above.)"},
+            ]
+            if len(self._summary_lines) <= 1 or estimate_tokens(summary) <= summary_budget:
+                return summary
+            self._summary_lines.pop(0)
+            self._omitted_calls += 1
+
+    def compact(self):
+        """
+        Collapse old tool exchanges if the history is over budget.
+
+        Returns:
+            int: Number of tool exchanges collapsed
+        """
+        current = self.estimated_tokens()
+        if current <= self.token_budget:
+            return 0
+
+        # The latest exchange answers the pending tool calls and stays verbatim
+        target = self.token_budget // 2
+        collapse = 0
+        saved = 0
+        for start in self._exchanges()[:-1]:
+            if current - saved <= target:
+                break
+            collapse += 1
+            saved += estimate_tokens(self.messages[start:start + 2])
+        if collapse == 0:
+            return 0
+
+        end = self._summary_end + 2 * collapse
+        self._summary_lines.extend(self._summarize(self.messages[self._summary_end:end]))
+        # Replace the existing summary pair too, so there is only ever one
+        self.messages[1:end] = self._summary_messages()
+        self._summary_end = 3
+        return collapse
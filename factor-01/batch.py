@@ -0,0 +1,254 @@
+import argparse
+import json
+import os
+import socketserver
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import redirect_stdout
+
+# Requests processed at once; each worker shares the script's warm clients
+BATCH_WORKERS = 4
+
+# How confirmations are answered: None asks on the terminal, True/False
+# answers every confirmation without asking (batch mode)
+_auto_approve = None
+
+
+def set_auto_approve(approve):
+    """
+    Answer confirmations without prompting.
+
+    Args:
+        approve (bool): True to approve every confirmation, False to decline, None to ask again
+    """
+    global _auto_approve
+    _auto_approve = approve
+
+
+def confirm(prompt):
+    """
+    Ask the user to confirm an action, or answer from the batch policy.
+
+    Args:
+        prompt (str): Question shown to the user, e.g. "Run this? (y/n): "
+
+    Returns:
+        bool: True if the action was confirmed
+    """
+    if _auto_approve is None:
+        return input(prompt).lower() in ('y', 'yes')
+    print(f"{prompt}{'y' if _auto_approve else 'n'} (batch mode)")
+    return _auto_approve
+
+
+def parse_request(line, line_number):
+    """
+    Parse one JSONL request.
+
+    A request is either a JSON string (the prompt) or an object with a
+    "prompt" key and an optional "id" (defaults to the line number).
+
+    Args:
+        line (str): One line of input
+        line_number (int): 1-based line number, used as the default id
+
+    Returns:
+        dict: Request with "id" and "prompt"
+
+    Raises:
+        ValueError: If the line isn't a valid request
+    """
+    request = json.loads(line)
+    if isinstance(request, str):
+        request = {"prompt": request}
+    if not isinstance(request, dict) or not isinstance(request.get("prompt"), str):
+        raise ValueError('expected a JSON string or an object with a "prompt" string')
+    return {"id": request.get("id", line_number), **request}
+
+
+def run_request(handler, request):
+    """
+    Run one request and wrap the outcome as a result record.
+
+    Args:
+        handler (callable): Takes the prompt and returns a dict of result fields (including "cost")
+        request (dict): Parsed request
+
+    Returns:
+        dict: Result with id, status, latency_s and the handler's fields, or an error
+    """
+    start = time.perf_counter()
+    try:
+        fields = handler(request["prompt"])
+        status = "error" if "error" in fields else "ok"
+    except Exception as e:
+        fields = {"error": f"{type(e).__name__}: {e}"}
+        status = "error"
+    if "cost" in fields:
+        fields["cost"] = round(fields["cost"], 6)
+    return {
+        "id": request["id"],
+        "status": status,
+        "latency_s": round(time.perf_counter() - start, 3),
+        **fields,
+    }
+
+
+class ResultWriter:
+    """Writes result records as JSON lines, one at a time across worker threads."""
+
+    def __init__(self, stream):
+        self._stream = stream
+        self._lock = threading.Lock()
+        self.count = 0
+        self.errors = 0
+
+    def write(self, result):
+        line = json.dumps(result, default=str) + "\n"
+        with self._lock:
+            self.count += 1
+            self.errors += result["status"] != "ok"
+            self._stream.write(line)
+            self._stream.flush()
+
+
+def process_lines(handler, lines, writer, executor):
+    """
+    Submit requests as lines arrive and write results as they complete.
+
+    Results are written in completion order; use the id to match them to requests.
+
+    Args:
+        handler (callable): Request handler, see run_request
+        lines (iterable): JSONL request lines
+        writer (ResultWriter): Where results go
+        executor (ThreadPoolExecutor): Workers running the requests
+    """
+    def run_and_write(request):
+        writer.write(run_request(handler, request))
+
+    futures = []
+    for line_number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            request = parse_request(line, line_number)
+        except ValueError as e:
+            writer.write({"id": line_number, "status": "error", "latency_s": 0.0, "error": f"invalid request: {e}"})
+            continue
+        futures.append(executor.submit(run_and_write, request))
+    wait(futures)
+
+
+class _TextSocketWriter:
+    """Adapts a binary socket file to the text write/flush interface ResultWriter uses."""
+
+    def __init__(self, wfile):
+        self._wfile = wfile
+
+    def write(self, text):
+        self._wfile.write(text.encode())
+
+    def flush(self):
+        self._wfile.flush()
+
+
+def serve_socket(handler, path, executor):
+    """
+    Accept JSONL requests on a Unix socket until interrupted.
+
+    Each connection sends request lines and receives result lines on the
+    same connection; connections share the worker pool and warm clients.
+
+    Args:
+        handler (callable): Request handler, see run_request
+        path (str): Socket path, replaced if it already exists
+        executor (ThreadPoolExecutor): Workers running the requests
+    """
+
+    class Connection(socketserver.StreamRequestHandler):
+        def handle(self):
+            lines = (line.decode() for line in self.rfile)
+            process_lines(handler, lines, ResultWriter(_TextSocketWriter(self.wfile)), executor)
+
+    if os.path.exists(path):
+        os.remove(path)
+    with socketserver.ThreadingUnixStreamServer(path, Connection) as server:
+        print(f"Listening on {path}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            os.remove(path)
+
+
+def run_batch(handler, source, workers=BATCH_WORKERS, auto_approve=False, ledger=None):
+    """
+    Process requests without prompting, with shared clients and a worker pool.
+
+    Results are written to stdout as JSON lines (or to the socket connection);
+    everything the scripts normally print goes to stderr instead.
+
+    Args:
+        handler (callable): Takes a prompt, returns a dict of result fields
+        source (str): JSONL file path, "-" for stdin, or "unix:PATH" to serve on a Unix socket
+        workers (int): Requests processed at once
+        auto_approve (bool): Approve every confirmation instead of declining
+        ledger (CostLedger): Session ledger, for the closing cost summary
+    """
+    set_auto_approve(auto_approve)
+    results = sys.stdout
+    start = time.perf_counter()
+    with redirect_stdout(sys.stderr), ThreadPoolExecutor(max_workers=workers, thread_name_prefix="batch") as executor:
+        if source.startswith("unix:"):
+            serve_socket(handler, source[len("unix:"):], executor)
+            return
+        writer = ResultWriter(results)
+        if source == "-":
+            process_lines(handler, sys.stdin, writer, executor)
+        else:
+            with open(source, 'r') as file:
+                process_lines(handler, file, writer, executor)
+
+    summary = f"{writer.count} requests, {writer.errors} errors in {time.perf_counter() - start:.2f}s"
+    if ledger is not None:
+        summary += f", total cost ${ledger.total:.4f}"
+    print(summary, file=sys.stderr)
+
+
+class _RefuseAutoApprove(argparse.Action):
+    """--auto-approve for scripts whose confirmations guard arbitrary shell commands."""
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        parser.error(
+            f"{option_string} is refused by this script: its confirmations run LLM-generated shell "
+            "commands, which must be reviewed one by one"
+        )
+
+
+def add_batch_arguments(parser, allow_auto_approve=True):
+    """
+    Add the --batch, --workers and --auto-approve options to an argument parser.
+
+    Args:
+        parser (argparse.ArgumentParser): Parser to extend
+        allow_auto_approve (bool): False for scripts whose confirmations guard
+            arbitrary shell commands; --auto-approve is then refused
+    """
+    parser.add_argument("--batch", metavar="SOURCE", help='Process JSONL requests from a file, "-" for stdin, or "unix:PATH" to serve on a Unix socket')
+    parser.add_argument("--workers", type=int, default=BATCH_WORKERS, help="Requests processed at once in batch mode")
+    if allow_auto_approve:
+        parser.add_argument(
+            "--auto-approve", action="store_true",
+            help="Approve every confirmation in batch mode (default: decline). Approved actions run unreviewed, "
+                 "including requests sent by anyone who can connect to a unix: socket",
+        )
+    else:
+        parser.set_defaults(auto_approve=False)
+        parser.add_argument(
+            "--auto-approve", action=_RefuseAutoApprove, nargs=0,
+            help="Refused: this script's confirmations run LLM-generated shell commands",
+        )
@@ -0,0 +1,61 @@
+import importlib
+import threading
+
+
+class LazyModule:
+    """
+    Stand-in for a module that is imported on first attribute access.
+
+    The factor-01 scripts depend on packages that take hundreds of
+    milliseconds to import (anthropic, boto3). Binding them with
+    lazy_import() lets the scripts reach the user prompt before paying for
+    them. The import runs at most once, under a lock, so tool threads can
+    share the same stand-in.
+    """
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __repr__(self):
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module {self._name!r} ({state})>"
+
+    @property
+    def loaded(self):
+        return self._module is not None
+
+    def preload(self):
+        """
+        Start importing the module in a background thread.
+
+        Call this just before waiting on user input, so the import overlaps
+        with the time the user spends typing.
+        """
+        if self._module is None:
+            threading.Thread(target=self._load, name=f"preload-{self._name}", daemon=True).start()
+        return self
+
+
+def lazy_import(name):
+    """
+    Bind a module without importing it yet.
+
+    Args:
+        name (str): Module name, e.g. "boto3" or "botocore.exceptions"
+
+    Returns:
+        LazyModule: Imports the module on first attribute access
+    """
+    return LazyModule(name)
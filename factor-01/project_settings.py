@@ -0,0 +1,109 @@
+import os
+from dataclasses import dataclass
+from typing import Dict
+
+from tool_registry import ToolArgumentError
+
+# Bucket defaults shared by the single-tool and workflow examples
+PROJECT_MD_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "02-single-tool", "PROJECT.md")
+
+# PROJECT.md section headings and provider names mapped to provider keys
+PROVIDER_SECTIONS = {
+    "AWS S3 Settings": "aws",
+    "Google Cloud Storage Settings": "gcs",
+}
+PROVIDER_NAMES = {
+    "aws": "aws",
+    "s3": "aws",
+    "gcp": "gcs",
+    "gcs": "gcs",
+    "google": "gcs",
+}
+
+
+@dataclass(frozen=True)
+class ProjectSettings:
+    """Bucket defaults parsed from PROJECT.md"""
+    provider: str
+    prefix: str
+    regions: Dict[str, str]
+
+    def bucket_name(self, name):
+        """Apply the global prefix unless the name already has it."""
+        return name if name.startswith(self.prefix) else f"{self.prefix}{name}"
+
+    def region(self, provider, region=None):
+        """
+        Use the requested region, or the provider's default.
+
+        Raises:
+            ToolArgumentError: If no region was requested and PROJECT.md has no default
+        """
+        region = region or self.regions.get(provider)
+        if not region:
+            raise ToolArgumentError(
+                f"no region given and PROJECT.md has no default region for {provider}; "
+                "ask the user which region to use"
+            )
+        return region
+
+
+def parse_project_settings(text):
+    """
+    Parse PROJECT.md into typed settings.
+
+    Reads "- key: value" items, using the enclosing "###" heading to tell
+    apart the per-provider region settings.
+
+    Args:
+        text (str): Content of PROJECT.md
+
+    Returns:
+        ProjectSettings: Parsed settings
+    """
+    provider, prefix, regions = "aws", "", {}
+    section = None
+    for line in text.splitlines():
+        line = line.strip()
+        if line.startswith("### "):
+            section = line[4:].strip()
+        elif line.startswith("- ") and ":" in line:
+            key, value = (part.strip() for part in line[2:].split(":", 1))
+            if key == "provider":
+                provider = PROVIDER_NAMES.get(value.lower(), value.lower())
+            elif key == "prefix":
+                prefix = value
+            elif key == "region" and section in PROVIDER_SECTIONS:
+                regions[PROVIDER_SECTIONS[section]] = value
+    return ProjectSettings(provider=provider, prefix=prefix, regions=regions)
+
+
+_settings_cache = (None, None)
+
+
+def project_settings(path=PROJECT_MD_PATH):
+    """
+    Get project settings, re-parsing PROJECT.md only when it has changed.
+
+    A missing file gives the defaults: AWS, no prefix and no default regions.
+
+    Args:
+        path (str): Location of PROJECT.md
+
+    Returns:
+        ProjectSettings: Settings from PROJECT.md
+    """
+    global _settings_cache
+    try:
+        mtime = (path, os.stat(path).st_mtime_ns)
+    except OSError:
+        mtime = (path, None)
+    cached_mtime, settings = _settings_cache
+    if mtime != cached_mtime:
+        if mtime[1] is None:
+            settings = parse_project_settings("")
+        else:
+            with open(path, 'r') as file:
+                settings = parse_project_settings(file.read())
+        _settings_cache = (mtime, settings)
+    return settings
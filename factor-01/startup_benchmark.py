@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+SCRIPTS = {
+    "01-no-tools": os.path.join(ROOT, "01-no-tools", "simple_prompt.py"),
+    "02-single-tool": os.path.join(ROOT, "02-single-tool", "cloud_bucket_creator.py"),
+    "03-workflow": os.path.join(ROOT, "03-workflow", "aws_tools.py"),
+}
+
+# What each script imported at module load before lazy imports, for comparison
+EAGER_IMPORTS = "import anthropic, boto3, botocore.exceptions, httpx"
+
+
+def time_to_prompt(script):
+    """
+    Start a script and time how long it takes to show its input prompt.
+
+    The script is run with -X importtime and killed as soon as the prompt
+    appears, so the import log only covers startup (plus whatever the
+    scripts' background preloads finished by then).
+
+    Args:
+        script (str): Path of the script to run
+
+    Returns:
+        tuple: (seconds until the prompt appeared, -X importtime output)
+    """
+    env = dict(os.environ, ANTHROPIC_API_KEY=os.environ.get("ANTHROPIC_API_KEY", "benchmark"))
+    # The import log goes to a file; a full stderr pipe would stall the script
+    with tempfile.TemporaryFile() as log:
+        start = time.perf_counter()
+        process = subprocess.Popen(
+            [sys.executable, "-X", "importtime", script],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=log, env=env,
+        )
+        # input() flushes the prompt, so the first bytes on stdout are the prompt
+        os.read(process.stdout.fileno(), 1)
+        elapsed = time.perf_counter() - start
+        process.kill()
+        process.communicate()
+        log.seek(0)
+        return elapsed, log.read().decode(errors="replace")
+
+
+def time_eager_imports():
+    """
+    Time a fresh interpreter importing the SDKs up front.
+
+    Returns:
+        float: Seconds until the imports finished
+    """
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", EAGER_IMPORTS], check=True)
+    return time.perf_counter() - start
+
+
+def slowest_imports(importtime, count):
+    """
+    Parse -X importtime output into the slowest top-level imports.
+
+    Args:
+        importtime (str): stderr of a python -X importtime run
+        count (int): Number of imports to return
+
+    Returns:
+        list: (cumulative microseconds, module) tuples, slowest first
+    """
+    imports = []
+    for line in importtime.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line[len("import time:"):].split("|")
+        # Top-level imports have no indentation before the module name
+        if not module[1:].startswith(" "):
+            imports.append((int(cumulative), module.strip()))
+    return sorted(imports, reverse=True)[:count]
+
+
+def report(name, latencies):
+    print(f"{name:<40} median {statistics.median(latencies) * 1000:8.1f} ms  min {min(latencies) * 1000:8.1f} ms  n={len(latencies)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold start time to the input prompt for the factor-01 scripts")
+    parser.add_argument("scripts", nargs="*", help=f"Scripts to measure: {', '.join(SCRIPTS)} (default: all)")
+    parser.add_argument("-n", "--iterations", type=int, default=5, help="Runs per script")
+    parser.add_argument("--top", type=int, default=8, help="Slowest imports to list per script")
+    args = parser.parse_args()
+
+    unknown = set(args.scripts) - set(SCRIPTS)
+    if unknown:
+        parser.error(f"unknown scripts: {', '.join(sorted(unknown))}")
+
+    print("Cold start to prompt")
+    report("eager SDK imports (previous behavior)", [time_eager_imports() for _ in range(args.iterations)])
+    for name in args.scripts or SCRIPTS:
+        runs = [time_to_prompt(SCRIPTS[name]) for _ in range(args.iterations)]
+        report(name, [elapsed for elapsed, _ in runs])
+        for cumulative, module in slowest_imports(runs[-1][1], args.top):
+            print(f"    {cumulative / 1000:8.1f} ms  {module}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,12 @@
+import os
+import sys
+
+# The factor-01 modules are run as scripts; shared modules live in factor-01
+# and the repo root, the examples in their own directories
+FACTOR_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [
+    os.path.join(FACTOR_DIR, "02-single-tool"),
+    os.path.join(FACTOR_DIR, "03-workflow"),
+    FACTOR_DIR,
+    os.path.dirname(FACTOR_DIR),
+]
@@ -0,0 +1,54 @@
+import json
+
+import pytest
+
+moto = pytest.importorskip("moto")
+
+import aws_tools
+from project_settings import project_settings
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    for name in ("AWS_ACCESS_KEY_ID", "AWS_SECRET_ACCESS_KEY"):
+        monkeypatch.setenv(name, "testing")
+    with moto.mock_aws():
+        # Clients and existence results from other tests belong to another mock
+        aws_tools._s3_clients.clear()
+        aws_tools._bucket_exists_cache.clear()
+        yield aws_tools.get_s3_client("us-east-1")
+        aws_tools._s3_clients.clear()
+        aws_tools._bucket_exists_cache.clear()
+
+
+def bucket_names(s3):
+    return {bucket["Name"] for bucket in s3.list_buckets()["Buckets"]}
+
+
+def test_create_buckets_creates_valid_spec_after_invalid_duplicate(s3):
+    results = json.loads(aws_tools.create_buckets([
+        {"bucket_name": "x1", "region": "bogus"},
+        {"bucket_name": "x1", "region": "us-west-2"},
+    ]))
+    name = project_settings().bucket_name("x1")
+    assert [result["status"] for result in results] == ["invalid", "created"]
+    assert bucket_names(s3) == {name}
+
+
+def test_create_buckets_skips_duplicate_pending_spec(s3):
+    results = json.loads(aws_tools.create_buckets([
+        {"bucket_name": "x2", "region": "us-west-2"},
+        {"bucket_name": "x2", "region": "eu-west-1"},
+    ]))
+    assert [result["status"] for result in results] == ["created", "skipped"]
+
+
+def test_single_and_bulk_creation_apply_the_same_prefix(s3):
+    aws_tools.create_bucket("logs", "us-west-2")
+    json.loads(aws_tools.create_buckets([
+        {"bucket_name": "artifacts", "region": "us-west-2"},
+        {"bucket_name": "backups", "region": "us-west-2"},
+    ]))
+    settings = project_settings()
+    assert bucket_names(s3) == {settings.bucket_name(name) for name in ("logs", "artifacts", "backups")}
+    assert aws_tools.bucket_exists("logs", "us-west-2") == "bucket exists"
@@ -0,0 +1,33 @@
+import asyncio
+import time
+
+from cloud_bucket_creator import SubprocessExecutor
+
+
+def collect():
+    lines = []
+    return lines, lambda text, end="\n": lines.append(text + end)
+
+
+def test_run_reports_failure_without_output():
+    lines, output = collect()
+    result = asyncio.run(SubprocessExecutor().run("exit 3", output))
+    assert "Command failed with exit code 3" in result
+    assert lines == ["Command failed with exit code 3\n"]
+
+
+def test_run_streams_output():
+    lines, output = collect()
+    result = asyncio.run(SubprocessExecutor().run("echo hello; echo oops >&2", output))
+    assert sorted(lines) == ["[stderr] oops\n", "[stdout] hello\n"]
+    assert "failed" not in result
+
+
+def test_run_many_runs_commands_concurrently_in_order():
+    _, output = collect()
+    start = time.perf_counter()
+    results = asyncio.run(SubprocessExecutor().run_many(
+        [f"sleep 0.3; echo {index}" for index in range(3)], output
+    ))
+    assert time.perf_counter() - start < 0.8
+    assert [result.split("Output:\n")[1].strip() for result in results] == ["0", "1", "2"]
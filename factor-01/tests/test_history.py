@@ -0,0 +1,70 @@
+from history import ConversationHistory
+
+PROMPT = {"role": "user", "content": "Create buckets logs and artifacts in us-west-2 please"}
+
+
+def add_exchange(history, turn):
+    history.append({"role": "assistant", "content": [{
+        "type": "tool_use", "id": f"t{turn}", "name": "bucket_exists",
+        "input": {"bucket_name": f"bucket-{turn}", "region": "us-west-2"},
+    }]})
+    history.append({"role": "user", "content": [{
+        "type": "tool_result", "tool_use_id": f"t{turn}", "content": "bucket does not exist",
+    }]})
+
+
+def run_turns(history, turns):
+    collapsed = []
+    for turn in range(turns):
+        add_exchange(history, turn)
+        collapsed.append(history.compact())
+    return collapsed
+
+
+def test_compact_leaves_history_under_budget_alone():
+    history = ConversationHistory(token_budget=8000)
+    history.append(PROMPT)
+    run_turns(history, 3)
+    assert len(history.messages) == 7
+    assert history.messages[0] == PROMPT
+
+
+def test_compact_keeps_history_under_budget_over_many_turns():
+    history = ConversationHistory(token_budget=200)
+    history.append(PROMPT)
+    collapsed = run_turns(history, 30)
+    assert history.estimated_tokens() <= 200
+    # Compacting down to half the budget leaves room for several more turns
+    assert collapsed.count(0) >= len(collapsed) // 2
+
+
+def test_compact_keeps_latest_exchange_and_alternating_roles():
+    history = ConversationHistory(token_budget=200)
+    history.append(PROMPT)
+    run_turns(history, 10)
+    assert history.messages[0] == PROMPT
+    assert history.messages[-1]["content"][0]["tool_use_id"] == "t9"
+    assert history.messages[-2]["content"][0]["id"] == "t9"
+    roles = [message["role"] for message in history.messages]
+    assert roles == ["user", "assistant"] * (len(roles) // 2) + ["user"]
+
+
+def test_summary_rolls_up_oldest_calls():
+    history = ConversationHistory(token_budget=200)
+    history.append(PROMPT)
+    run_turns(history, 30)
+    summary = history.messages[1]["content"]
+    assert "earlier tool calls omitted" in summary
+    assert "bucket-0'" not in summary
+    assert summary.count("- bucket_exists(") < 30
+
+
+def test_request_messages_marks_cache_breakpoint_on_a_copy():
+    history = ConversationHistory()
+    history.append(PROMPT)
+    add_exchange(history, 0)
+    messages = history.request_messages()
+    assert messages[-1]["content"][-1]["cache_control"] == {"type": "ephemeral"}
+    assert messages[:-1] == history.messages[:-1]
+    assert "cache_control" not in history.messages[-1]["content"][-1]
+    assert ConversationHistory().request_messages() == []
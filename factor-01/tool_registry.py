@@ -0,0 +1,268 @@
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Callable, Mapping
+
+# JSON schema types accepted for tool parameters and the Python types they map to
+JSON_TYPES = {
+    "string": str,
+    "integer": int,
+    "number": (int, float),
+    "boolean": bool,
+    "array": list,
+    "object": dict,
+}
+
+
+class ToolArgumentError(ValueError):
+    """Raised when the LLM calls a tool with arguments that don't match its schema."""
+
+
+def _freeze(value):
+    """Return a read-only copy of a JSON-like value."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _thaw(value):
+    """Return a plain dict/list copy of a frozen value, for sending to the API."""
+    if isinstance(value, Mapping):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    return value
+
+
+def _compile_validator(schema, path):
+    """
+    Compile a JSON schema fragment into a validation function.
+
+    Only the subset used by the tools is supported: type, items, properties
+    and required.
+
+    Args:
+        schema (dict): Schema with a "type" key
+        path (str): Location of the value, used in error messages
+
+    Returns:
+        callable: Takes a value and returns a list of error strings
+    """
+    expected = schema["type"]
+    if expected not in JSON_TYPES:
+        raise ValueError(f"unsupported parameter type {expected!r} at {path}")
+    python_type = JSON_TYPES[expected]
+    checks = []
+
+    if expected == "array" and "items" in schema:
+        item_validator = _compile_validator(schema["items"], f"{path}[]")
+
+        def check_items(value):
+            errors = []
+            for index, item in enumerate(value):
+                errors.extend(error.replace(f"{path}[]", f"{path}[{index}]", 1) for error in item_validator(item))
+            return errors
+
+        checks.append(check_items)
+
+    if expected == "object" and "properties" in schema:
+        property_validators = {
+            name: _compile_validator(property_schema, f"{path}.{name}")
+            for name, property_schema in schema["properties"].items()
+        }
+        required = tuple(schema.get("required", ()))
+
+        def check_properties(value):
+            errors = [f"{path}.{name}: missing required property" for name in required if name not in value]
+            for name, item in value.items():
+                validator = property_validators.get(name)
+                if validator is None:
+                    errors.append(f"{path}.{name}: unexpected property")
+                else:
+                    errors.extend(validator(item))
+            return errors
+
+        checks.append(check_properties)
+
+    def validate(value):
+        # bool is a subclass of int, but true/false is never a valid number here
+        if not isinstance(value, python_type) or (isinstance(value, bool) and expected != "boolean"):
+            return [f"{path}: expected {expected}, got {type(value).__name__}"]
+        errors = []
+        for check in checks:
+            errors.extend(check(value))
+        return errors
+
+    return validate
+
+
+@dataclass(frozen=True)
+class Tool:
+    """A registered tool: the function, its LLM schema and a compiled argument validator."""
+
+    name: str
+    function: Callable
+    description: str
+    requires_confirmation: bool
+    schema: Mapping = field(repr=False)
+    validator: Callable = field(repr=False)
+
+    def validate(self, arguments):
+        """
+        Check tool arguments against the schema.
+
+        Args:
+            arguments (dict): Tool input from the LLM
+
+        Raises:
+            ToolArgumentError: If the arguments don't match the schema
+        """
+        errors = self.validator(arguments)
+        if errors:
+            raise ToolArgumentError(f"invalid arguments for {self.name}: {'; '.join(errors)}")
+
+    def __call__(self, arguments):
+        """
+        Validate arguments and call the tool.
+
+        Args:
+            arguments (dict): Tool input from the LLM
+
+        Returns:
+            The tool function's return value
+
+        Raises:
+            ToolArgumentError: If the arguments don't match the schema
+        """
+        self.validate(arguments)
+        return self.function(**arguments)
+
+
+class ToolRegistry:
+    """
+    Tools available to the LLM, registered once with a decorator.
+
+    Schemas and validators are built when a tool is registered, so each
+    request reuses the same tool descriptions and dispatch is a dict lookup.
+
+    Example:
+        TOOLS = ToolRegistry()
+
+        @TOOLS.tool(
+            "Checks if the provided region is a valid AWS region",
+            {"region": {"type": "string", "description": "The AWS region to check"}},
+        )
+        def is_valid_region(region):
+            ...
+    """
+
+    def __init__(self):
+        self._tools = {}
+        self._descriptions = []
+
+    def tool(self, description, parameters, requires_confirmation=False, name=None):
+        """
+        Decorator that registers a function as a tool.
+
+        Args:
+            description (str): Tool description shown to the LLM
+            parameters (dict): Parameter name to schema ("type", "description",
+                optional "items"); set "required": False for optional parameters
+            requires_confirmation (bool): Whether the user must confirm each call
+            name (str): Tool name, defaults to the function name
+
+        Returns:
+            callable: Decorator returning the function unchanged
+        """
+
+        def register(function):
+            tool_name = name or function.__name__
+            if tool_name in self._tools:
+                raise ValueError(f"tool {tool_name!r} is already registered")
+            properties = {
+                param_name: {key: value for key, value in param_info.items() if key in ("type", "description", "items")}
+                for param_name, param_info in parameters.items()
+            }
+            input_schema = {
+                "type": "object",
+                "properties": properties,
+                "required": [
+                    param_name for param_name, param_info in parameters.items() if param_info.get("required", True)
+                ],
+            }
+            schema = _freeze({
+                "type": "custom",
+                "name": tool_name,
+                "description": description,
+                "input_schema": input_schema,
+            })
+            self._tools[tool_name] = Tool(
+                name=tool_name,
+                function=function,
+                description=description,
+                requires_confirmation=requires_confirmation,
+                schema=schema,
+                validator=_compile_validator(input_schema, "input"),
+            )
+            self._descriptions.append(_thaw(schema))
+            return function
+
+        return register
+
+    def __getitem__(self, tool_name):
+        return self._tools[tool_name]
+
+    def __contains__(self, tool_name):
+        return tool_name in self._tools
+
+    def __iter__(self):
+        return iter(self._tools.values())
+
+    def descriptions(self):
+        """
+        Get descriptions of the registered tools in the LLM tool calling format.
+
+        The list is built at registration and shared between requests; don't
+        modify it.
+
+        Returns:
+            list: Tool descriptions compatible with LLM tool calling format
+        """
+        return self._descriptions
+
+    def validate(self, tool_name, arguments):
+        """
+        Check a tool call before running it.
+
+        Args:
+            tool_name (str): Name of the tool the LLM called
+            arguments (dict): Tool input from the LLM
+
+        Returns:
+            Tool: The tool to call
+
+        Raises:
+            ToolArgumentError: If the tool is unknown or the arguments are invalid
+        """
+        tool = self._tools.get(tool_name)
+        if tool is None:
+            raise ToolArgumentError(f"unknown tool {tool_name!r}")
+        tool.validate(arguments)
+        return tool
+
+    def dispatch(self, tool_name, arguments):
+        """
+        Validate arguments and call a tool by name.
+
+        Args:
+            tool_name (str): Name of the tool the LLM called
+            arguments (dict): Tool input from the LLM
+
+        Returns:
+            The tool function's return value
+
+        Raises:
+            ToolArgumentError: If the tool is unknown or the arguments are invalid
+        """
+        return self.validate(tool_name, arguments).function(**arguments)
@@ -2,9 +2,16 @@ from crewai import Agent, Crew, Process, Task
 from crewai.project import CrewBase, agent, crew, task
 from crewai.agents.agent_builder.base_agent import BaseAgent
 from crewai.knowledge.source.base_knowledge_source import BaseKnowledgeSource
-from crewai.knowledge.source.text_file_knowledge_source import TextFileKnowledgeSource
 from functools import cached_property
-from typing import List
+from typing import Any, Dict, List, Optional
+
+from chatbot.embeddings import embedder_config
+from chatbot.knowledge_index import IndexedTextFileKnowledgeSource, drop_stale_collections, knowledge_file_paths
+from chatbot.router import DirectAnswerer
+from chatbot.tools import KnowledgeSearchTool
+
+KNOWLEDGE_CHUNK_SIZE = 1000
+KNOWLEDGE_CHUNK_OVERLAP = 150
 
 @CrewBase
 class Chatbot():
@@ -13,21 +20,37 @@ class Chatbot():
     agents: List[BaseAgent]
     tasks: List[Task]
 
+    @cached_property
+    def embedder(self) -> Optional[Dict[str, Any]]:
+        # Local embeddings by default (KNOWLEDGE_EMBEDDER=openai for CrewAI's default);
+        # collections built with another embedder are dropped and re-indexed
+        embedder = embedder_config()
+        drop_stale_collections(embedder)
+        return embedder
+
     @cached_property
     def knowledge_sources(self) -> List[BaseKnowledgeSource]:
-        # Create text file knowledge source with relative paths from knowledge directory
+        # Index every markdown file in the knowledge directory; only new or
+        # changed files are embedded, the rest come from the persistent index
         return [
-            TextFileKnowledgeSource(
-                file_paths=[
-                    "code-review-guidelines.md",
-                    "blue-green-deployment.md",
-                    "error-rate-runbook.md",
-                    "kubernetes-cluster-setup.md",
-                    "database-outage.md"
-                ],
+            IndexedTextFileKnowledgeSource(
+                file_paths=knowledge_file_paths(),
+                # Section-sized chunks, so keyword and vector search can
+                # point at the relevant part of a runbook
+                chunk_size=KNOWLEDGE_CHUNK_SIZE,
+                chunk_overlap=KNOWLEDGE_CHUNK_OVERLAP,
             ),
         ]
 
+    @cached_property
+    def knowledge_search(self) -> KnowledgeSearchTool:
+        # Shared by the researcher and the router's direct answers
+        return KnowledgeSearchTool(embedder=self.embedder)
+
+    def direct_answerer(self) -> DirectAnswerer:
+        """Single-call answerer for lookup questions, see chatbot.router"""
+        return DirectAnswerer(self.devops_assistant(), self.knowledge_search)
+
     @agent
     def knowledge_researcher(self) -> Agent:
         """Create the knowledge researcher agent"""
@@ -35,6 +58,8 @@ class Chatbot():
             config=self.agents_config['knowledge_researcher'],  # type: ignore[index]
             verbose=True,
             knowledge_sources=self.knowledge_sources,
+            embedder=self.embedder,
+            tools=[self.knowledge_search],
         )
 
     @agent
@@ -68,4 +93,5 @@ class Chatbot():
             process=Process.sequential,
             verbose=True,
             knowledge_sources=self.knowledge_sources,
+            embedder=self.embedder,
         )
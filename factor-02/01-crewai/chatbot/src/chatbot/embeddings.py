@@ -0,0 +1,178 @@
+import hashlib
+import os
+import sqlite3
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+from chromadb import Documents, EmbeddingFunction, Embeddings
+from crewai.utilities.paths import db_storage_path
+
+# Which embedder the knowledge base uses: "local" runs a sentence-transformers
+# model on this machine, "openai" keeps CrewAI's default remote embeddings
+EMBEDDER_ENV = "KNOWLEDGE_EMBEDDER"
+MODEL_ENV = "KNOWLEDGE_EMBEDDING_MODEL"
+BACKEND_ENV = "KNOWLEDGE_EMBEDDING_BACKEND"
+
+DEFAULT_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+# "onnx" runs the all-MiniLM-L6-v2 model bundled with chromadb on onnxruntime;
+# "torch" runs any sentence-transformers model and needs the
+# sentence-transformers extra (uv sync --extra sentence-transformers)
+DEFAULT_BACKEND = "onnx"
+ONNX_MODELS = {DEFAULT_MODEL, "all-MiniLM-L6-v2"}
+# Texts encoded per forward pass; small enough to keep CPU memory flat
+EMBEDDING_BATCH_SIZE = 64
+
+
+class EmbeddingCache:
+    """Persistent embedding cache keyed by a hash of model and text.
+
+    Re-indexing a changed file usually re-embeds mostly unchanged chunks, and
+    repeated questions embed the same query text; both become lookups.
+    """
+
+    def __init__(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(path), check_same_thread=False)
+        self._db.execute("CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)")
+        self._db.commit()
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, np.ndarray]:
+        found: Dict[str, np.ndarray] = {}
+        with self._lock:
+            # Stay under SQLite's bound-parameter limit
+            for start in range(0, len(keys), 500):
+                batch = keys[start:start + 500]
+                rows = self._db.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(batch))})", batch
+                )
+                found.update((key, np.frombuffer(vector, dtype=np.float32)) for key, vector in rows)
+        return found
+
+    def put_many(self, vectors: Dict[str, np.ndarray]) -> None:
+        with self._lock:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                [(key, vector.astype(np.float32).tobytes()) for key, vector in vectors.items()],
+            )
+            self._db.commit()
+
+
+class LocalEmbeddingFunction(EmbeddingFunction[Documents]):
+    """Chroma embedding function backed by a local embedding model.
+
+    Embeds on CPU without network calls once the model is downloaded. The
+    "onnx" backend uses chromadb's onnxruntime MiniLM and needs no torch;
+    "torch" loads a sentence-transformers model. Texts are de-duplicated,
+    looked up in the embedding cache, and only the misses are encoded, in
+    batches of EMBEDDING_BATCH_SIZE. The model is loaded on first use, so
+    building a crew whose knowledge index is current never loads it.
+    """
+
+    def __init__(self, model_name: str = DEFAULT_MODEL, backend: str = DEFAULT_BACKEND,
+                 batch_size: int = EMBEDDING_BATCH_SIZE, cache: Optional[EmbeddingCache] = None):
+        if backend not in ("onnx", "torch"):
+            raise ValueError(f"{BACKEND_ENV} must be 'onnx' or 'torch', got {backend!r}")
+        if backend == "onnx" and model_name not in ONNX_MODELS:
+            raise ValueError(
+                f"the onnx backend only runs {DEFAULT_MODEL}; set {BACKEND_ENV}=torch to use {model_name}"
+            )
+        self.model_name = model_name
+        self.backend = backend
+        self.batch_size = batch_size
+        self._cache = cache
+        self._model = None
+        self._lock = threading.Lock()
+
+    @property
+    def model(self) -> Any:
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    self._model = self._load_model()
+        return self._model
+
+    def _load_model(self) -> Any:
+        if self.backend == "onnx":
+            from chromadb.utils.embedding_functions import ONNXMiniLM_L6_V2
+
+            return ONNXMiniLM_L6_V2(preferred_providers=["CPUExecutionProvider"])
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError as e:
+            raise ImportError(
+                f"{BACKEND_ENV}=torch needs the sentence-transformers extra: uv sync --extra sentence-transformers"
+            ) from e
+        return SentenceTransformer(self.model_name, device="cpu")
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        if self.backend == "onnx":
+            # Batches and normalizes internally
+            return np.asarray(self.model(texts), dtype=np.float32)
+        return self.model.encode(
+            texts,
+            batch_size=self.batch_size,
+            normalize_embeddings=True,
+            convert_to_numpy=True,
+        ).astype(np.float32)
+
+    def _key(self, text: str) -> str:
+        # The backends run the same weights but don't produce identical vectors
+        return hashlib.sha256(f"{self.model_name}\0{self.backend}\0{text}".encode("utf-8")).hexdigest()
+
+    def __call__(self, input: Documents) -> Embeddings:
+        keys = [self._key(text) for text in input]
+        vectors = self._cache.get_many(list(set(keys))) if self._cache else {}
+
+        missing = {key: text for key, text in zip(keys, input) if key not in vectors}
+        if missing:
+            encoded = self._encode(list(missing.values()))
+            new_vectors = dict(zip(missing, encoded))
+            if self._cache:
+                self._cache.put_many(new_vectors)
+            vectors.update(new_vectors)
+
+        return [vectors[key] for key in keys]
+
+    @staticmethod
+    def name() -> str:
+        return "chatbot-local-sentence-transformer"
+
+    def get_config(self) -> Dict[str, Any]:
+        return {"model_name": self.model_name, "backend": self.backend, "batch_size": self.batch_size}
+
+    @staticmethod
+    def build_from_config(config: Dict[str, Any]) -> "LocalEmbeddingFunction":
+        return LocalEmbeddingFunction(**config)
+
+
+@lru_cache(maxsize=None)
+def local_embedding_function(model_name: str = DEFAULT_MODEL, backend: str = DEFAULT_BACKEND) -> LocalEmbeddingFunction:
+    """Shared local embedder, so agents and the crew load the model at most once."""
+    cache = EmbeddingCache(Path(db_storage_path()) / "embedding_cache" / "embeddings.sqlite3")
+    return LocalEmbeddingFunction(model_name=model_name, backend=backend, cache=cache)
+
+
+def embedder_config() -> Optional[Dict[str, Any]]:
+    """Embedder config for the chatbot's agents and crew.
+
+    Reads KNOWLEDGE_EMBEDDER ("local" by default, or "openai"),
+    KNOWLEDGE_EMBEDDING_MODEL and KNOWLEDGE_EMBEDDING_BACKEND ("onnx" by
+    default, or "torch").
+
+    Returns:
+        A CrewAI custom embedder config, or None for CrewAI's default embedder
+    """
+    provider = os.environ.get(EMBEDDER_ENV, "local").lower()
+    if provider == "openai":
+        return None
+    if provider != "local":
+        raise ValueError(f"{EMBEDDER_ENV} must be 'local' or 'openai', got {provider!r}")
+    embedder = local_embedding_function(
+        os.environ.get(MODEL_ENV, DEFAULT_MODEL),
+        os.environ.get(BACKEND_ENV, DEFAULT_BACKEND),
+    )
+    return {"provider": "custom", "config": {"embedder": embedder}}
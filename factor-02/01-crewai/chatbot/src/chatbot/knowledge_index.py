@@ -0,0 +1,127 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import chromadb
+from chromadb.config import Settings
+from crewai.knowledge.source.text_file_knowledge_source import TextFileKnowledgeSource
+from crewai.knowledge.storage.knowledge_storage import KnowledgeStorage
+from crewai.utilities.constants import KNOWLEDGE_DIRECTORY
+from crewai.utilities.paths import db_storage_path
+
+
+def _file_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _embedder_id(embedding_function: Any) -> Dict[str, Any]:
+    """Name and config of an embedding function, as Chroma persists them with a collection."""
+    name = embedding_function.name() if hasattr(embedding_function, "name") else type(embedding_function).__name__
+    config = embedding_function.get_config() if hasattr(embedding_function, "get_config") else {}
+    # Round-trip through JSON so it compares equal to the persisted form
+    return json.loads(json.dumps({"name": name, "config": config}, default=str))
+
+
+class IndexedTextFileKnowledgeSource(TextFileKnowledgeSource):
+    """Text file knowledge source backed by a persistent, incrementally updated index.
+
+    CrewAI stores knowledge chunks in a persistent Chroma collection, but
+    TextFileKnowledgeSource re-chunks and re-embeds every file each time a
+    crew is built. This source keeps a manifest of file content hashes next
+    to the collection and only re-embeds files that were added or changed,
+    removing the chunks of changed and deleted files first. Chunks are tagged
+    with their source file so they can be replaced per file.
+    """
+
+    def add(self) -> None:
+        """Embed new and changed files, and drop chunks of changed or removed files."""
+        collection = self.storage.collection
+        manifest_path = self._manifest_path()
+        manifest = self._load_manifest(manifest_path)
+        embedder = _embedder_id(self.storage.embedder)
+        chunking = [self.chunk_size, self.chunk_overlap]
+
+        # A different embedder or chunking, or an emptied collection, invalidates the whole index
+        indexed: Dict[str, str] = manifest.get("files", {})
+        if manifest.get("embedder") != embedder or manifest.get("chunking") != chunking or collection.count() == 0:
+            for path in indexed:
+                collection.delete(where={"source": path})
+            indexed = {}
+
+        current = {str(path): (text, _file_hash(text)) for path, text in self.content.items()}
+        changed = [path for path, (_, digest) in current.items() if indexed.get(path) != digest]
+        removed = [path for path in indexed if path not in current]
+
+        for path in changed + removed:
+            collection.delete(where={"source": path})
+        for path in changed:
+            text, _ = current[path]
+            chunks = self._chunk_text(text)
+            self.chunks.extend(chunks)
+            self.storage.save(chunks, metadata={"source": path})
+
+        if changed or removed or not manifest_path.exists():
+            self._write_manifest(manifest_path, {
+                "embedder": embedder,
+                "chunking": chunking,
+                "files": {path: digest for path, (_, digest) in current.items()},
+            })
+
+    def _manifest_path(self) -> Path:
+        """Manifest location, one per knowledge collection, inside CrewAI's knowledge storage."""
+        return Path(db_storage_path()) / KNOWLEDGE_DIRECTORY / "manifests" / f"{self.storage.collection.name}.json"
+
+    @staticmethod
+    def _load_manifest(path: Path) -> Dict:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def _write_manifest(path: Path, manifest: Dict) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, path)
+
+
+def knowledge_file_paths(knowledge_dir: str = KNOWLEDGE_DIRECTORY) -> List[str]:
+    """All markdown files in the knowledge directory, relative to it."""
+    return sorted(path.name for path in Path(knowledge_dir).glob("*.md"))
+
+
+def drop_stale_collections(embedder: Optional[Dict[str, Any]] = None) -> List[str]:
+    """Delete knowledge collections that were built with a different embedder.
+
+    Chroma refuses to open a collection with an embedding function other than
+    the one it was created with, so switching embedders would otherwise fail
+    until the knowledge storage is reset. Call this before building the crew;
+    dropped collections are rebuilt by the next add().
+
+    Args:
+        embedder: CrewAI embedder config the crew will use (None for CrewAI's default)
+
+    Returns:
+        Names of the dropped collections
+    """
+    base_path = Path(db_storage_path()) / KNOWLEDGE_DIRECTORY
+    if not base_path.exists():
+        return []
+    expected = _embedder_id(KnowledgeStorage(embedder=embedder).embedder)
+    # Same settings as CrewAI's client; Chroma rejects a second client for the path otherwise
+    client = chromadb.PersistentClient(path=str(base_path), settings=Settings(allow_reset=True))
+
+    dropped = []
+    for collection in client.list_collections():
+        persisted = (collection.configuration_json or {}).get("embedding_function")
+        if not persisted or persisted.get("type") != "known":
+            continue
+        if {"name": persisted.get("name"), "config": persisted.get("config") or {}} != expected:
+            client.delete_collection(collection.name)
+            dropped.append(collection.name)
+    return dropped
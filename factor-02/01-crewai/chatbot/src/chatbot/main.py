@@ -6,6 +6,7 @@ from dotenv import load_dotenv
 import openlit
 
 from chatbot.crew import Chatbot
+from chatbot.session import ChatSession
 
 # Configure logging
 log_level = logging.DEBUG if os.environ.get("DEVOPS_DEBUG", "").lower() in ["1", "true", "yes"] else logging.WARNING
@@ -24,6 +25,12 @@ def run():
     print("Ask me anything about DevOps, deployments, Kubernetes, or engineering practices.")
     print("Type 'exit', 'quit', or Ctrl+C to end the conversation.\n")
 
+    # Build the crew once; every turn reuses its agents, tasks and knowledge.
+    # Lookup questions skip the crew and get a single retrieval + LLM call.
+    chatbot = Chatbot()
+    session = ChatSession(chatbot.crew, direct_answerer=chatbot.direct_answerer)
+    print(f"Crew ready in {session.build_time:.2f}s")
+
     try:
         while True:
             # Get user question
@@ -38,10 +45,10 @@ def run():
             if not user_input.strip():
                 continue
 
-            # Process the question using native crewAI
-            inputs = {'user_question': user_input}
-            result = Chatbot().crew().kickoff(inputs=inputs)
-            print(f"Assistant: {result.raw}")
+            # Process the question with the session's warm crew
+            answer, timings = session.ask(user_input)
+            print(f"Assistant: {answer}")
+            print(f"({timings})")
     except EOFError:
         print("\nDetected closed input stream. Exiting.")
     except KeyboardInterrupt:
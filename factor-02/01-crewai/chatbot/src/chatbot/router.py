@@ -0,0 +1,109 @@
+import re
+from dataclasses import dataclass
+
+from crewai import Agent
+
+from chatbot.tools import KnowledgeSearchTool, SearchResults
+
+# Wording that asks for synthesis rather than a lookup
+SYNTHESIS_PATTERN = re.compile(
+    r"\b(compare|comparison|versus|vs|differences?|trade-?offs?|pros and cons|relationship|"
+    r"combine|together|both|across|overall|end-to-end|strategy|strategies)\b",
+    re.IGNORECASE,
+)
+# A second question chained onto the first: "... and how do we ..."
+CHAINED_QUESTION_PATTERN = re.compile(
+    r"\b(and|or|also|then)\s+(how|what|why|when|where|which|who|should|can|do|does|is|are)\b",
+    re.IGNORECASE,
+)
+# Longer questions usually bundle several asks
+MAX_DIRECT_WORDS = 30
+# Passages retrieved per turn, used for routing and given to whichever path answers
+DIRECT_PASSAGES = 4
+
+
+@dataclass
+class Route:
+    """Which path answers a question, and why"""
+
+    direct: bool
+    reason: str
+
+    @property
+    def name(self) -> str:
+        return "direct" if self.direct else "crew"
+
+
+def classify(question: str, results: SearchResults) -> Route:
+    """Decide whether a question is a direct lookup or needs the full crew.
+
+    Uses the wording of the question and where its retrieved passages come
+    from: a lookup is answered by one document, so the keyword and semantic
+    retrievers rank the same file first. When they point at different
+    files, the question likely spans topics and goes to the crew.
+
+    Args:
+        question: The user's message
+        results: Hybrid search results for the question
+
+    Returns:
+        The route to take
+    """
+    if SYNTHESIS_PATTERN.search(question):
+        return Route(direct=False, reason="asks for synthesis")
+    if question.count("?") > 1 or CHAINED_QUESTION_PATTERN.search(question):
+        return Route(direct=False, reason="several questions")
+    if len(question.split()) > MAX_DIRECT_WORDS:
+        return Route(direct=False, reason="long question")
+    if not results.passages:
+        return Route(direct=True, reason="no matching passages")
+
+    # Top matches of the full rankings, not just the fused passages
+    if results.keyword_top is None:
+        return Route(direct=False, reason="no keyword match")
+    if results.keyword_top != results.semantic_top:
+        return Route(direct=False, reason=f"matches in {results.keyword_top} and {results.semantic_top}")
+    return Route(direct=True, reason=f"lookup in {results.keyword_top}")
+
+
+class DirectAnswerer:
+    """Answers lookup questions with one retrieval and one LLM call.
+
+    Reuses the DevOps assistant agent's persona and LLM client and the
+    researcher's hybrid search, so answers read like the crew's without its
+    two agent loops.
+    """
+
+    def __init__(self, agent: Agent, search: KnowledgeSearchTool):
+        self.agent = agent
+        self.search_tool = search
+
+    def search(self, question: str) -> SearchResults:
+        return self.search_tool.search(question, top_k=DIRECT_PASSAGES)
+
+    def answer(self, question: str, results: SearchResults) -> str:
+        """Answer from the retrieved passages in a single LLM call.
+
+        Args:
+            question: The user's message
+            results: Passages retrieved for the question
+
+        Returns:
+            The answer text
+        """
+        messages = [
+            {
+                "role": "system",
+                "content": f"You are a {self.agent.role.strip()}. {self.agent.goal.strip()}\n{self.agent.backstory.strip()}",
+            },
+            {
+                "role": "user",
+                "content": (
+                    "Answer the question using only these passages from the knowledge base. "
+                    "If they do not contain the answer, say so.\n\n"
+                    f"<passages>\n{results.format()}\n</passages>\n\n"
+                    f"Question: {question}"
+                ),
+            },
+        ]
+        return self.agent.llm.call(messages)
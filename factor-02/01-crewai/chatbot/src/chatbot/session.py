@@ -0,0 +1,167 @@
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from crewai import Crew
+from crewai.utilities.events import (
+    LLMCallCompletedEvent,
+    LLMCallFailedEvent,
+    LLMCallStartedEvent,
+    crewai_event_bus,
+)
+
+from chatbot.router import DirectAnswerer, Route, classify
+
+# Same placeholder syntax CrewAI interpolates into task and agent templates
+PLACEHOLDER_PATTERN = re.compile(r"\{([A-Za-z_][A-Za-z0-9_\-]*)\}")
+# Stands in for the turn's passages when the session has no router
+NO_PASSAGES = "None yet, search the knowledge base."
+
+
+def sanitize_input(value: str, placeholders: Iterable[str]) -> str:
+    """Make user text safe to interpolate into the crew's task templates.
+
+    CrewAI substitutes each template placeholder into the whole string again,
+    so a question containing `{user_question}` would be expanded with itself.
+    Padding the braces of the crew's own placeholders keeps the text readable
+    while taking it out of the placeholder syntax; other braces (`${HOME}`,
+    JSON) are left alone.
+
+    Args:
+        value: User text
+        placeholders: Placeholder names used by the crew's templates
+    """
+    if not isinstance(value, str):
+        raise TypeError(f"expected a string, got {type(value).__name__}")
+    placeholders = set(placeholders)
+    return PLACEHOLDER_PATTERN.sub(
+        lambda match: f"{{ {match.group(1)} }}" if match.group(1) in placeholders else match.group(0),
+        value.strip(),
+    )
+
+
+@dataclass
+class TurnTimings:
+    """Wall-clock breakdown of one chat turn, in seconds"""
+
+    total: float
+    llm: float
+    llm_calls: int
+    route: str = "crew"
+
+    @property
+    def overhead(self) -> float:
+        """Time spent outside LLM calls: task setup, executors, knowledge queries, tools"""
+        return max(self.total - self.llm, 0.0)
+
+    def __str__(self) -> str:
+        return (
+            f"{self.route}: {self.total:.2f}s total, {self.llm:.2f}s in {self.llm_calls} LLM calls, "
+            f"{self.overhead * 1000:.0f}ms overhead"
+        )
+
+
+class LLMTimer:
+    """Accumulates LLM call time from CrewAI's event bus.
+
+    Handlers are registered once per process; the timer only counts calls
+    made while a turn is active.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._started: Dict[int, float] = {}
+        self._active = False
+        self.elapsed = 0.0
+        self.calls = 0
+        crewai_event_bus.register_handler(LLMCallStartedEvent, self._on_started)
+        crewai_event_bus.register_handler(LLMCallCompletedEvent, self._on_finished)
+        crewai_event_bus.register_handler(LLMCallFailedEvent, self._on_finished)
+
+    def start_turn(self) -> None:
+        with self._lock:
+            self._started.clear()
+            self.elapsed = 0.0
+            self.calls = 0
+            self._active = True
+
+    def end_turn(self) -> Tuple[float, int]:
+        with self._lock:
+            self._active = False
+            return self.elapsed, self.calls
+
+    # Calls on the same thread don't overlap, so the thread id pairs start and finish events
+    def _on_started(self, source: Any, event: LLMCallStartedEvent) -> None:
+        with self._lock:
+            if self._active:
+                self._started[threading.get_ident()] = time.perf_counter()
+
+    def _on_finished(self, source: Any, event: Any) -> None:
+        with self._lock:
+            started = self._started.pop(threading.get_ident(), None)
+            if self._active and started is not None:
+                self.elapsed += time.perf_counter() - started
+                self.calls += 1
+
+
+class ChatSession:
+    """A crew built once and reused for every turn of a conversation.
+
+    Building the crew loads the YAML configs, creates the agents, tasks and
+    LLM clients and syncs the knowledge index; a session pays for that once
+    instead of per question. Each turn only interpolates the new inputs into
+    the existing tasks, so turns are serialized with a lock.
+
+    With a direct answerer, each question is first routed (chatbot.router):
+    lookups are answered from one retrieval and a single LLM call, and only
+    multi-topic questions run the crew. The crew is handed the passages the
+    router already retrieved, so its researcher only searches for what they
+    don't cover.
+    """
+
+    _timer: Optional[LLMTimer] = None
+
+    def __init__(self, build_crew: Callable[[], Crew], direct_answerer: Optional[Callable[[], DirectAnswerer]] = None):
+        start = time.perf_counter()
+        self.crew = build_crew()
+        self.direct_answerer = direct_answerer() if direct_answerer else None
+        self.build_time = time.perf_counter() - start
+        self.placeholders = self.crew.fetch_inputs()
+        self._lock = threading.Lock()
+        if ChatSession._timer is None:
+            ChatSession._timer = LLMTimer()
+
+    def ask(self, question: str) -> Tuple[str, TurnTimings]:
+        """Run one turn through the warm crew.
+
+        Args:
+            question: The user's message
+
+        Returns:
+            The answer and the turn's timing breakdown
+        """
+        route = Route(direct=False, reason="no router")
+        passages = NO_PASSAGES
+        with self._lock:
+            self._timer.start_turn()
+            start = time.perf_counter()
+            try:
+                if self.direct_answerer:
+                    results = self.direct_answerer.search(question)
+                    route = classify(question, results)
+                    passages = results.format()
+                if route.direct:
+                    answer = self.direct_answerer.answer(question, results)
+                else:
+                    inputs = {
+                        "user_question": sanitize_input(question, self.placeholders),
+                        "retrieved_passages": sanitize_input(passages, self.placeholders),
+                    }
+                    answer = self.crew.kickoff(inputs=inputs).raw
+            finally:
+                total = time.perf_counter() - start
+                llm, calls = self._timer.end_turn()
+        timings = TurnTimings(total=total, llm=llm, llm_calls=calls, route=f"{route.name} ({route.reason})")
+        return answer, timings
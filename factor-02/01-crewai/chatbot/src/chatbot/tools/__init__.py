@@ -0,0 +1,3 @@
+from chatbot.tools.knowledge_search import KnowledgeSearchTool, SearchResult, SearchResults
+
+__all__ = ["KnowledgeSearchTool", "SearchResult", "SearchResults"]
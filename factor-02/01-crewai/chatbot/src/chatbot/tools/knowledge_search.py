@@ -0,0 +1,213 @@
+import math
+import re
+import threading
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Type
+
+from crewai.knowledge.storage.knowledge_storage import KnowledgeStorage
+from crewai.tools import BaseTool
+from pydantic import BaseModel, Field, PrivateAttr
+
+# Keeps commands, metric names and thresholds whole: kubectl, error_rate,
+# pg_stat_activity, 99.9, 5xx, /healthz
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:[._\-/:][a-z0-9]+)*")
+SEPARATOR_PATTERN = re.compile(r"[._\-/:]")
+
+# Candidates taken from each retriever before fusion
+CANDIDATES = 20
+# Standard reciprocal rank fusion constant; damps the weight of top ranks
+RRF_K = 60
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase terms, with compound terms also indexed by their parts.
+
+    "pg_stat_activity" yields the whole term plus "pg", "stat" and
+    "activity", so exact identifiers score highest while partial mentions
+    still match.
+    """
+    tokens = []
+    for token in TOKEN_PATTERN.findall(text.lower()):
+        tokens.append(token)
+        parts = SEPARATOR_PATTERN.split(token)
+        if len(parts) > 1:
+            tokens.extend(part for part in parts if part)
+    return tokens
+
+
+class BM25Index:
+    """Okapi BM25 over a fixed set of documents, with precomputed term weights.
+
+    Each posting stores the document's full BM25 contribution for the term,
+    so scoring a query is one dict lookup per query term plus additions.
+    """
+
+    def __init__(self, documents: Sequence[str], k1: float = 1.5, b: float = 0.75):
+        term_counts = [Counter(tokenize(document)) for document in documents]
+        lengths = [sum(counts.values()) for counts in term_counts]
+        average_length = sum(lengths) / len(lengths) if lengths else 0.0
+
+        document_frequency: Counter = Counter()
+        for counts in term_counts:
+            document_frequency.update(counts.keys())
+
+        count = len(documents)
+        self.postings: Dict[str, List[Tuple[int, float]]] = defaultdict(list)
+        for index, (counts, length) in enumerate(zip(term_counts, lengths)):
+            norm = k1 * (1 - b + b * length / average_length) if average_length else k1
+            for term, frequency in counts.items():
+                df = document_frequency[term]
+                idf = math.log(1 + (count - df + 0.5) / (df + 0.5))
+                self.postings[term].append((index, idf * frequency * (k1 + 1) / (frequency + norm)))
+        self.postings = dict(self.postings)
+
+    def search(self, query: str, limit: int) -> List[Tuple[int, float]]:
+        """Best-scoring documents for a query.
+
+        Returns:
+            (document index, score) pairs, best first
+        """
+        scores: Dict[int, float] = defaultdict(float)
+        for term in set(tokenize(query)):
+            for index, weight in self.postings.get(term, ()):
+                scores[index] += weight
+        return sorted(scores.items(), key=lambda item: item[1], reverse=True)[:limit]
+
+
+def reciprocal_rank_fusion(rankings: Iterable[Sequence[str]], k: int = RRF_K) -> Dict[str, float]:
+    """Fuse ranked id lists by summing 1 / (k + rank).
+
+    Rank-based, so BM25 scores and embedding distances don't need to be
+    put on a common scale.
+    """
+    fused: Dict[str, float] = defaultdict(float)
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking, 1):
+            fused[doc_id] += 1 / (k + rank)
+    return dict(fused)
+
+
+@dataclass
+class SearchResult:
+    """One passage returned by a hybrid search"""
+
+    source: str
+    text: str
+    score: float
+    keyword_rank: Optional[int] = None
+    semantic_rank: Optional[int] = None
+
+    def format(self, position: int) -> str:
+        matched = []
+        if self.keyword_rank:
+            matched.append(f"keyword #{self.keyword_rank}")
+        if self.semantic_rank:
+            matched.append(f"semantic #{self.semantic_rank}")
+        return f"[{position}] {self.source} ({', '.join(matched)})\n{self.text.strip()}"
+
+
+@dataclass
+class SearchResults:
+    """Fused passages of a hybrid search, plus where each retriever's best match is.
+
+    keyword_top and semantic_top are the source files of the first result of
+    the full BM25 and vector rankings, whether or not that chunk made it
+    into the fused passages.
+    """
+
+    passages: List[SearchResult]
+    keyword_top: Optional[str] = None
+    semantic_top: Optional[str] = None
+
+    def format(self) -> str:
+        if not self.passages:
+            return "No matching passages in the knowledge base."
+        return "\n\n".join(result.format(position) for position, result in enumerate(self.passages, 1))
+
+
+class KnowledgeSearchInput(BaseModel):
+    """Input schema for KnowledgeSearchTool."""
+    query: str = Field(..., description="What to look up. Include exact terms such as commands, metric names or thresholds.")
+    top_k: int = Field(4, description="Number of passages to return.", ge=1, le=10)
+
+
+class KnowledgeSearchTool(BaseTool):
+    name: str = "Knowledge Search"
+    description: str = (
+        "Search the DevOps knowledge base with combined keyword (BM25) and semantic matching. "
+        "Use it for exact terms like command names, metric names and thresholds as well as general questions. "
+        "Returns the best matching passages with their source files."
+    )
+    args_schema: Type[BaseModel] = KnowledgeSearchInput
+    embedder: Optional[Dict[str, Any]] = None
+    collection_name: str = "crew"
+
+    _storage: Optional[KnowledgeStorage] = PrivateAttr(default=None)
+    _ids: List[str] = PrivateAttr(default_factory=list)
+    _documents: Dict[str, Tuple[str, str]] = PrivateAttr(default_factory=dict)
+    _bm25: Optional[BM25Index] = PrivateAttr(default=None)
+    _lock: Any = PrivateAttr(default_factory=threading.Lock)
+
+    def _load(self) -> None:
+        """Open the knowledge collection and build the BM25 index over its chunks.
+
+        Runs on first use, after the crew has synced the knowledge index, and
+        indexes the same chunks (and ids) the vector search returns.
+        """
+        with self._lock:
+            if self._bm25 is not None:
+                return
+            storage = KnowledgeStorage(embedder=self.embedder, collection_name=self.collection_name)
+            storage.initialize_knowledge_storage()
+            chunks = storage.collection.get(include=["documents", "metadatas"])
+            metadatas = chunks["metadatas"] or [None] * len(chunks["ids"])
+            self._ids = list(chunks["ids"])
+            self._documents = {
+                doc_id: (document, (metadata or {}).get("source", "knowledge base"))
+                for doc_id, document, metadata in zip(chunks["ids"], chunks["documents"], metadatas)
+            }
+            self._bm25 = BM25Index(chunks["documents"])
+            self._storage = storage
+
+    def _vector_search(self, query: str, limit: int) -> List[str]:
+        if not self._ids:
+            return []
+        results = self._storage.collection.query(
+            query_texts=[query], n_results=min(limit, len(self._ids)), include=["distances"]
+        )
+        return results["ids"][0]
+
+    def search(self, query: str, top_k: int = 4) -> SearchResults:
+        """Hybrid search of the knowledge base.
+
+        Args:
+            query: Search text
+            top_k: Number of passages to return
+
+        Returns:
+            Best passages first, with each retriever's top source
+        """
+        self._load()
+        lexical = [self._ids[index] for index, _ in self._bm25.search(query, CANDIDATES)]
+        semantic = self._vector_search(query, CANDIDATES)
+        fused = reciprocal_rank_fusion([lexical, semantic])
+
+        passages = []
+        for doc_id in sorted(fused, key=fused.get, reverse=True)[:top_k]:
+            text, source = self._documents[doc_id]
+            passages.append(SearchResult(
+                source=source,
+                text=text,
+                score=fused[doc_id],
+                keyword_rank=lexical.index(doc_id) + 1 if doc_id in lexical else None,
+                semantic_rank=semantic.index(doc_id) + 1 if doc_id in semantic else None,
+            ))
+        return SearchResults(
+            passages=passages,
+            keyword_top=self._documents[lexical[0]][1] if lexical else None,
+            semantic_top=self._documents[semantic[0]][1] if semantic else None,
+        )
+
+    def _run(self, query: str, top_k: int = 4) -> str:
+        return self.search(query, top_k).format()
@@ -0,0 +1,47 @@
+from chatbot.tools.knowledge_search import BM25Index, reciprocal_rank_fusion, tokenize
+
+DOCUMENTS = [
+    "Query pg_stat_activity to find long running PostgreSQL sessions.",
+    "Page the on-call engineer when the error_rate exceeds 5% for 10 minutes.",
+    "Use kubectl rollout undo to roll back a failed deployment.",
+]
+
+
+def test_tokenize_keeps_compound_terms_and_their_parts():
+    tokens = tokenize("Check pg_stat_activity and /healthz")
+    assert tokens[:4] == ["check", "pg_stat_activity", "pg", "stat"]
+    assert "activity" in tokens
+    assert "/healthz" not in tokens and "healthz" in tokens
+
+
+def test_tokenize_keeps_numbers_whole():
+    assert tokenize("Target 99.9% uptime") == ["target", "99.9", "99", "9", "uptime"]
+
+
+def test_bm25_ranks_exact_identifier_first():
+    index = BM25Index(DOCUMENTS)
+    results = index.search("how do I check pg_stat_activity", limit=3)
+    assert results[0][0] == 0
+    assert all(score > 0 for _, score in results)
+
+
+def test_bm25_respects_limit_and_ignores_unknown_terms():
+    index = BM25Index(DOCUMENTS)
+    assert len(index.search("kubectl error_rate pg_stat_activity", limit=2)) == 2
+    assert index.search("terraform", limit=3) == []
+
+
+def test_bm25_empty_index():
+    assert BM25Index([]).search("kubectl", limit=3) == []
+
+
+def test_reciprocal_rank_fusion_rewards_agreement():
+    fused = reciprocal_rank_fusion([["a", "b", "c"], ["b", "a", "d"]], k=60)
+    assert fused["a"] == fused["b"] == 1 / 61 + 1 / 62
+    assert fused["c"] == fused["d"] == 1 / 63
+    assert set(fused) == {"a", "b", "c", "d"}
+
+
+def test_reciprocal_rank_fusion_of_nothing():
+    assert reciprocal_rank_fusion([]) == {}
+    assert reciprocal_rank_fusion([[], ["a"]]) == {"a": 1 / 61}
@@ -0,0 +1,48 @@
+from chatbot.router import classify
+from chatbot.tools import SearchResult, SearchResults
+
+RUNBOOK = "knowledge/error-rate-runbook.md"
+PLAYBOOK = "knowledge/database-outage.md"
+
+
+def results(keyword_top=RUNBOOK, semantic_top=RUNBOOK):
+    passages = [SearchResult(source=RUNBOOK, text="Threshold: >5% error rate for 5 min", score=0.03,
+                             keyword_rank=1, semantic_rank=1)]
+    return SearchResults(passages=passages, keyword_top=keyword_top, semantic_top=semantic_top)
+
+
+def test_lookup_when_both_retrievers_agree():
+    route = classify("What is the error rate alert threshold?", results())
+    assert route.direct
+    assert route.reason == f"lookup in {RUNBOOK}"
+
+
+def test_crew_when_retrievers_disagree():
+    route = classify("How do I check pg_stat_activity?", results(semantic_top=PLAYBOOK))
+    assert not route.direct
+    assert RUNBOOK in route.reason and PLAYBOOK in route.reason
+
+
+def test_uses_retriever_tops_outside_fused_passages():
+    # The keyword retriever's best chunk isn't among the fused passages, but
+    # its file still decides the route
+    search = results()
+    search.passages[0].keyword_rank = None
+    assert classify("What is the error rate alert threshold?", search).direct
+
+
+def test_crew_without_keyword_match():
+    assert classify("What is the error rate alert threshold?", results(keyword_top=None)).reason == "no keyword match"
+
+
+def test_direct_without_passages():
+    route = classify("What is the error rate alert threshold?", SearchResults(passages=[]))
+    assert route.direct
+    assert route.reason == "no matching passages"
+
+
+def test_question_wording_sends_to_crew():
+    assert classify("Compare blue-green and canary deployments", results()).reason == "asks for synthesis"
+    assert classify("What is the threshold? Who gets paged?", results()).reason == "several questions"
+    assert classify("What is the threshold and how do we roll back?", results()).reason == "several questions"
+    assert classify(" ".join(["word"] * 31), results()).reason == "long question"
@@ -16,7 +16,8 @@ def _aggregate_format_results(results_data: Dict, model_filter: Optional[List[st
         model_filter: List of models to include (None = all models)
         
     Returns:
-        Dict mapping format names to aggregated quality/token/cost data
+        Dict mapping format names to aggregated quality/token/cost/latency data;
+        pre-screened results (empty, truncated, error) count as quality 0
     """
     if model_filter is None:
         model_filter = ["gpt-4.1", "sonnet-4", "gemini-2.5"]
@@ -29,15 +30,23 @@ def _aggregate_format_results(results_data: Dict, model_filter: Optional[List[st
                 format_aggregates[format_name] = {
                     'quality_scores': [], 
                     'token_counts': [], 
-                    'costs': []
+                    'costs': [],
+                    'times': [],
+                    'prescreened': 0
                 }
                 
             for model_name, result in format_results.items():
                 if model_name in model_filter:
-                    quality_score = result.get('quality', {}).get('overall', 0)
-                    format_aggregates[format_name]['quality_scores'].append(quality_score)
+                    quality = result.get('quality', {})
+                    # Pre-screened responses were unusable, so they score 0 rather than being skipped
+                    if quality.get('prescreened'):
+                        format_aggregates[format_name]['prescreened'] += 1
+                        format_aggregates[format_name]['quality_scores'].append(0.0)
+                    else:
+                        format_aggregates[format_name]['quality_scores'].append(quality.get('overall', 0))
                     format_aggregates[format_name]['token_counts'].append(result['total_tokens'])
                     format_aggregates[format_name]['costs'].append(result['cost'])
+                    format_aggregates[format_name]['times'].append(result.get('time', 0))
     
     return format_aggregates
 
@@ -60,7 +69,10 @@ def _calculate_format_statistics(format_aggregates: Dict) -> Dict:
                 'avg_quality': sum(data['quality_scores']) / len(data['quality_scores']),
                 'avg_tokens': sum(data['token_counts']) / len(data['token_counts']),
                 'avg_cost': sum(data['costs']) / len(data['costs']),
-                'sample_size': len(data['quality_scores'])
+                'avg_time': sum(data['times']) / len(data['times']),
+                'sample_size': len(data['quality_scores']),
+                'prescreened': data.get('prescreened', 0),
+                'prescreen_rate': data.get('prescreened', 0) / len(data['quality_scores'])
             }
     
     return quality_by_format
@@ -129,7 +141,8 @@ def _display_format_results(quality_by_format: Dict) -> List[Tuple]:
     sorted_formats = sorted(quality_by_format.items(), key=lambda x: x[1]['avg_quality'], reverse=True)
     
     for format_name, stats in sorted_formats:
-        print(f"{format_name:<25} Quality: {stats['avg_quality']:.3f} | Tokens: {stats['avg_tokens']:.0f} | Cost: ${stats['avg_cost']:.5f} | n={stats['sample_size']}")
+        prescreened = f" ({stats['prescreened']} pre-screened as 0)" if stats.get('prescreened') else ""
+        print(f"{format_name:<25} Quality: {stats['avg_quality']:.3f} | Tokens: {stats['avg_tokens']:.0f} | Cost: ${stats['avg_cost']:.5f} | n={stats['sample_size']}{prescreened}")
     
     return sorted_formats
 
@@ -201,9 +214,10 @@ def _display_detailed_results(results_data: Dict) -> int:
         
         for format_name, format_results in scenario_results.items():
             for model_name, result in format_results.items():
-                quality_score = result.get('quality', {}).get('overall', 0)
+                quality = result.get('quality', {})
+                quality_text = "skipped" if quality.get('prescreened') else f"{quality.get('overall', 0):.2f}"
                 test_count += 1
-                print(f"{format_name:<25} {model_name:<12} {result['total_tokens']:<8} ${result['cost']:<9.6f} {quality_score:<8.2f} {result['time']:<6.2f}s")
+                print(f"{format_name:<25} {model_name:<12} {result['total_tokens']:<8} ${result['cost']:<9.6f} {quality_text:<8} {result['time']:<6.2f}s")
     
     return test_count
 
@@ -3,11 +3,23 @@ Quality evaluation functions for Factor 3 testing
 Uses multi-model evaluation to eliminate single-model bias
 """
 
+import atexit
+import multiprocessing
+import os
+import sys
 import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+# The pricing table is shared with the other factors from the repo root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 import litellm
-from typing import Dict, List
 from langfuse.decorators import observe, langfuse_context
 from models import Scenario
+from scoring import SCORE_DIMENSIONS, prescore_response, score_response_locally
+from shared.pricing import CostLedger, openai_usage_tokens
+from telemetry import capture_trace_context, get_exporter
 
 # Latest model versions - LiteLLM format
 EVALUATION_MODELS = {
@@ -16,43 +28,89 @@ EVALUATION_MODELS = {
     "gemini-2.5": "gemini/gemini-2.5-pro-preview-05-06"
 }
 
+# Running cost of every candidate and judge call in this run
+COST_LEDGER = CostLedger()
+
+# Worker processes for CPU-bound local scorers, kept off the network path
+LOCAL_SCORING_WORKERS = 2
+_local_scoring_pool: Optional[ProcessPoolExecutor] = None
+
 
-def test_model(messages: List[Dict], model: str) -> Dict:
+def _get_local_scoring_pool() -> ProcessPoolExecutor:
+    """
+    Create the local scoring process pool on first use
+    
+    By then the telemetry, OTel and Langfuse threads are running, and a
+    forked child could inherit a lock one of them holds, so the workers
+    are spawned fresh instead.
+    """
+    global _local_scoring_pool
+    if _local_scoring_pool is None:
+        _local_scoring_pool = ProcessPoolExecutor(
+            max_workers=LOCAL_SCORING_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        atexit.register(_local_scoring_pool.shutdown)
+    return _local_scoring_pool
+
+
+def test_model(messages: List[Dict], model: str, labels: Optional[Dict[str, str]] = None) -> Dict:
     """
     Test a single model with given messages
     
     Args:
         messages: Conversation messages to send to model
         model: Model identifier for LiteLLM
+        labels: Metric attributes for this call (model, format, scenario, role, and
+            candidate_model for judge calls)
     
     Returns:
         Dict with response, token counts, cost, and timing
     """
+    labels = labels or {"model": model}
+    # Capture trace ids here; the exporter thread has no Langfuse context
+    trace_context = capture_trace_context()
     start_time = time.time()
     
-    response = litellm.completion(
-        model=model,
-        messages=messages,
-        max_tokens=16384,
-        temperature=0.1,
-        metadata={
-            # Nest LiteLLM calls under current Langfuse trace
-            "existing_trace_id": langfuse_context.get_current_trace_id(),
-            "parent_observation_id": langfuse_context.get_current_observation_id(),
-        },
-    )
+    try:
+        response = litellm.completion(
+            model=model,
+            messages=messages,
+            max_tokens=16384,
+            temperature=0.1,
+        )
+    except Exception as e:
+        get_exporter().submit("generation", {
+            "model": model, "messages": messages, "labels": labels, "trace_context": trace_context,
+            "start_time": start_time, "end_time": time.time(), "result": {}, "error": str(e),
+        })
+        raise
     
     end_time = time.time()
     
-    return {
+    result = {
         "response": response.choices[0].message.content,
+        "finish_reason": response.choices[0].finish_reason,
         "input_tokens": response.usage.prompt_tokens,
         "output_tokens": response.usage.completion_tokens,
         "total_tokens": response.usage.total_tokens,
         "time": end_time - start_time,
-        # LiteLLM automatically calculates accurate costs
-        "cost": litellm.completion_cost(completion_response=response)
+        # Cached input and reasoning tokens are priced separately; models
+        # missing from the shared table fall back to litellm's pricing
+        "cost": COST_LEDGER.record(
+            model, fallback=lambda: litellm.completion_cost(completion_response=response),
+            **openai_usage_tokens(response.usage),
+        ),
+        "cache_hit": bool(getattr(response, "_hidden_params", {}).get("cache_hit")),
     }
+    
+    # Langfuse logging and metrics happen on the background exporter thread
+    get_exporter().submit("generation", {
+        "model": model, "messages": messages, "labels": labels, "trace_context": trace_context,
+        "start_time": start_time, "end_time": end_time, "result": result,
+    })
+    
+    return result
 
 
 def _parse_evaluation_scores(scores_text: str) -> Dict[str, float]:
@@ -78,7 +136,8 @@ def _parse_evaluation_scores(scores_text: str) -> Dict[str, float]:
     return scores
 
 
-def evaluate_response_quality(response: str, scenario: Scenario) -> Dict[str, float]:
+def evaluate_response_quality(response: str, scenario: Scenario,
+                              labels: Optional[Dict[str, str]] = None) -> Dict[str, float]:
     """
     Evaluate response quality using multi-model scoring
     
@@ -92,13 +151,22 @@ def evaluate_response_quality(response: str, scenario: Scenario) -> Dict[str, fl
     - Context Utilization: Does it effectively use available context?
     - Overall: Holistic quality assessment
     
+    Deterministic rubric scores are computed in a worker process while the
+    judges run and merged in with a "local_" prefix (e.g. local_overall).
+    
     Args:
         response: AI response to evaluate
         scenario: Test scenario with context and criteria
+        labels: Metric attributes of the response being judged
         
     Returns:
-        Dict with averaged scores across all evaluation models
+        Dict with averaged scores across all evaluation models plus local scores
     """
+    # Start local rubric scoring in parallel with the LLM judges
+    local_future = _get_local_scoring_pool().submit(
+        score_response_locally, response, scenario.evaluation_criteria
+    )
+    
     # Extract data from scenario object
     user_request = scenario.get_user_request()
     user_profile = scenario.user_profile
@@ -141,12 +209,22 @@ Format: specificity:0.X personalization:0.X actionability:0.X context_utilizatio
 Only output the scores, nothing else."""
     
     # Use all three models for evaluation to eliminate bias
+    labels = labels or {"scenario": scenario.name}
     all_scores = []
-    for eval_model in EVALUATION_MODELS.values():
-        result = test_model([{"role": "user", "content": evaluation_prompt}], eval_model)
+    for eval_key, eval_model in EVALUATION_MODELS.items():
+        # Judge calls are billed to the judge; the judged model gets its own label
+        judge_labels = {**labels, "role": "judge", "model": eval_key}
+        if "model" in labels:
+            judge_labels["candidate_model"] = labels["model"]
+        result = test_model([{"role": "user", "content": evaluation_prompt}], eval_model, judge_labels)
         scores = _parse_evaluation_scores(result['response'])
         all_scores.append(scores)
     
+    get_exporter().submit("judge_disagreement", {
+        "overall_scores": [scores.get('overall', 0.0) for scores in all_scores],
+        "labels": labels,
+    })
+    
     # Average scores across all three models
     averaged_scores = {}
     score_keys = ['specificity', 'personalization', 'actionability', 'context_utilization', 'overall']
@@ -155,9 +233,35 @@ Only output the scores, nothing else."""
         scores_for_key = [scores.get(key, 0.0) for scores in all_scores]
         averaged_scores[key] = sum(scores_for_key) / len(scores_for_key)
     
+    # Merge local rubric scores into the same quality dict
+    for key, value in local_future.result().items():
+        averaged_scores[f"local_{key}"] = value
+    
     return averaged_scores
 
 
+def prescreened_quality(response: str, scenario: Scenario) -> Dict:
+    """
+    Quality dict for a response that failed the pre-screen
+    
+    Judge dimensions are 0.0 and the result is marked "prescreened" so the
+    aggregates in analysis.py count it as an unusable (quality 0) response;
+    the local rubric scores are still computed so it can be inspected.
+    
+    Args:
+        response: AI response that skipped the judges
+        scenario: Test scenario with evaluation criteria
+        
+    Returns:
+        Dict with zeroed judge scores, local scores and prescreened=True
+    """
+    quality = {key: 0.0 for key in SCORE_DIMENSIONS + ['overall']}
+    for key, value in score_response_locally(response, scenario.evaluation_criteria).items():
+        quality[f"local_{key}"] = value
+    quality['prescreened'] = True
+    return quality
+
+
 @observe(name="factor3_model_test")
 def test_model_and_evaluate(messages: List[Dict], model_key: str, model_name: str, 
                            model_id: str, scenario: Scenario, format_name: str) -> Dict:
@@ -180,12 +284,22 @@ def test_model_and_evaluate(messages: List[Dict], model_key: str, model_name: st
     """
     print(f"\n🤖 Testing {model_name}...")
     
+    labels = {"model": model_key, "format": format_name, "scenario": scenario.name}
+    
     # Test the model
-    result = test_model(messages, model_id)
+    result = test_model(messages, model_id, {**labels, "role": "candidate"})
+    
+    # Pre-screen locally so degenerate responses don't cost three judge calls
+    prescreen = prescore_response(result['response'], scenario.evaluation_criteria, result['finish_reason'])
+    result['prescreen'] = prescreen
     
-    # Evaluate response quality using multi-model scoring
-    print(f"📊 Evaluating with GPT-4.1, Sonnet 4, Gemini 2.5...")
-    quality = evaluate_response_quality(result['response'], scenario)
+    if prescreen['passed']:
+        # Evaluate response quality using multi-model scoring
+        print(f"📊 Evaluating with GPT-4.1, Sonnet 4, Gemini 2.5...")
+        quality = evaluate_response_quality(result['response'], scenario, labels)
+    else:
+        print(f"⏭️  Skipping judges: {prescreen['reason']} (finish reason: {result['finish_reason']})")
+        quality = prescreened_quality(result['response'], scenario)
     result['quality'] = quality
     
     # Print results
@@ -202,7 +316,9 @@ def test_model_and_evaluate(messages: List[Dict], model_key: str, model_name: st
             "total_tokens": result['total_tokens'],
             "cost": result['cost'],
             "quality_overall": quality['overall'],
-            "quality_scores": quality
+            "quality_scores": quality,
+            "prescore": prescreen['prescore'],
+            "prescreen_failed": not prescreen['passed']
         }
     )
     
@@ -17,12 +17,15 @@ from langfuse.decorators import observe
 # Import our modular components
 from models import load_test_scenarios
 from formatters import FORMATS, get_available_formats
-from evaluation import test_model_and_evaluate, EVALUATION_MODELS
+from evaluation import test_model_and_evaluate, EVALUATION_MODELS, COST_LEDGER
 from analysis import generate_comprehensive_summary, analyze_results_by_models
+from selector import FormatSelector, display_frontiers
+from metrics import init_metrics, shutdown_metrics, METRICS_FILE
+from telemetry import shutdown_exporter
 
 # Configure LiteLLM for multi-provider compatibility
-litellm.success_callback = ["langfuse"]
-litellm.failure_callback = ["langfuse"]
+# Langfuse logging is done by telemetry.py's background exporter rather
+# than LiteLLM's synchronous callbacks, keeping it off the request path
 litellm.modify_params = True  # Critical for Anthropic tool call compatibility
 
 load_dotenv()
@@ -84,6 +87,9 @@ def main():
     # Validate environment
     validate_api_keys()
     
+    # Export per-call metrics to a local file alongside the Langfuse traces
+    init_metrics()
+    
     # Load test scenarios
     scenarios = load_test_scenarios()
     
@@ -123,13 +129,30 @@ def main():
     with open(filename, 'w') as f:
         json.dump(all_results, f, indent=2)
     
+    # Drain queued telemetry, then flush remaining data points to the metrics file
+    telemetry_stats = shutdown_exporter()
+    shutdown_metrics()
+    if telemetry_stats:
+        print(f"\n📡 Telemetry: {telemetry_stats['exported']} events exported, {telemetry_stats['dropped']} dropped, "
+              f"{telemetry_stats['mean_enqueue_us']:.1f}µs mean hot-path overhead, "
+              f"{telemetry_stats['mean_export_us']:.1f}µs mean background export")
+    
     # Generate comprehensive analysis
     generate_comprehensive_summary(all_results)
     
+    print(f"\n💰 Total cost: ${COST_LEDGER.total:.4f}")
+    for model_id, totals in COST_LEDGER.summary().items():
+        unpriced = f"  ({totals['unpriced_calls']} unpriced)" if totals['unpriced_calls'] else ""
+        print(f"   {model_id:<40} {totals['calls']:>4} calls  ${totals['cost']:.4f}{unpriced}")
+    
     print(f"\n💾 Results saved to: {filename}")
+    print(f"📈 Metrics saved to: {METRICS_FILE}")
     
     # Run model comparison analysis
     analyze_results_by_models(all_results)
+    
+    # Show which formats are worth using per model
+    display_frontiers(FormatSelector(all_results))
 
 
 if __name__ == "__main__":
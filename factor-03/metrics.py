@@ -0,0 +1,108 @@
+"""
+OpenTelemetry metrics for Factor 3 testing
+Aggregatable latency, token, cost and judge metrics labelled by model/format/scenario
+
+Instruments are created against the global meter at import time, so they
+are no-ops until init_metrics() installs a MeterProvider. The provider
+exports to a local file, so metrics can be graphed without Langfuse.
+"""
+
+import os
+from typing import Dict, Optional
+
+from opentelemetry import metrics
+from opentelemetry.sdk.metrics import MeterProvider
+from opentelemetry.sdk.metrics.export import ConsoleMetricExporter, PeriodicExportingMetricReader
+
+METRICS_FILE = os.getenv("FACTOR3_METRICS_FILE", "factor3_metrics.jsonl")
+METRICS_EXPORT_INTERVAL_MS = 10_000
+
+_meter = metrics.get_meter("factor3")
+
+REQUEST_LATENCY = _meter.create_histogram(
+    "factor3.request.latency", unit="s", description="Wall-clock latency of a model completion"
+)
+TOKENS_IN = _meter.create_counter(
+    "factor3.tokens.input", unit="{token}", description="Prompt tokens sent"
+)
+TOKENS_OUT = _meter.create_counter(
+    "factor3.tokens.output", unit="{token}", description="Completion tokens received"
+)
+COST = _meter.create_counter(
+    "factor3.cost", unit="USD", description="Cost of model completions"
+)
+CACHE_HITS = _meter.create_counter(
+    "factor3.cache.hits", unit="{request}", description="Completions served from the LiteLLM cache"
+)
+JUDGE_DISAGREEMENT = _meter.create_histogram(
+    "factor3.judge.disagreement", description="Spread (max - min) of overall scores across judges"
+)
+
+_provider: Optional[MeterProvider] = None
+_metrics_file = None
+
+
+def init_metrics(filename: str = METRICS_FILE) -> MeterProvider:
+    """
+    Install a MeterProvider that periodically exports metrics to a file
+
+    Each export appends one JSON document with every metric data point.
+
+    Args:
+        filename: Path of the metrics file to append to
+
+    Returns:
+        The installed MeterProvider
+    """
+    global _provider, _metrics_file
+    if _provider is not None:
+        return _provider
+
+    _metrics_file = open(filename, 'a')
+    exporter = ConsoleMetricExporter(
+        out=_metrics_file,
+        formatter=lambda metrics_data: metrics_data.to_json(indent=None) + "\n",
+    )
+    reader = PeriodicExportingMetricReader(exporter, export_interval_millis=METRICS_EXPORT_INTERVAL_MS)
+    _provider = MeterProvider(metric_readers=[reader])
+    metrics.set_meter_provider(_provider)
+    return _provider
+
+
+def shutdown_metrics() -> None:
+    """Flush pending metrics to the file and stop the exporter"""
+    global _provider, _metrics_file
+    if _provider is None:
+        return
+    _provider.shutdown()
+    _metrics_file.close()
+    _provider = None
+    _metrics_file = None
+
+
+def record_completion(result: Dict, labels: Dict[str, str]) -> None:
+    """
+    Record latency, token, cost and cache metrics for one completion
+
+    Args:
+        result: Result dict from evaluation.test_model
+        labels: Metric attributes (model, format, scenario, role, candidate_model)
+    """
+    REQUEST_LATENCY.record(result['time'], labels)
+    TOKENS_IN.add(result['input_tokens'], labels)
+    TOKENS_OUT.add(result['output_tokens'], labels)
+    COST.add(result['cost'], labels)
+    if result.get('cache_hit'):
+        CACHE_HITS.add(1, labels)
+
+
+def record_judge_disagreement(overall_scores: list, labels: Dict[str, str]) -> None:
+    """
+    Record how far apart the judges' overall scores were
+
+    Args:
+        overall_scores: Overall score from each judge
+        labels: Metric attributes (model, format, scenario)
+    """
+    if overall_scores:
+        JUDGE_DISAGREEMENT.record(max(overall_scores) - min(overall_scores), labels)
@@ -0,0 +1,242 @@
+"""
+Local deterministic scoring for Factor 3 testing
+Rubric keyword matching against scenario evaluation criteria, no API calls
+
+Functions here run inside worker processes, so they only depend on the
+standard library and take plain data (strings and dicts) as arguments.
+"""
+
+import re
+from collections import deque
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+SCORE_DIMENSIONS = ['specificity', 'personalization', 'actionability', 'context_utilization']
+
+# Words that appear in nearly every criterion and carry no signal
+_STOPWORDS = {
+    'about', 'acknowledges', 'addresses', 'adapts', 'after', 'based', 'before', 'being',
+    'concrete', 'considers', 'current', 'details', 'effectively', 'given', 'includes',
+    'incorporates', 'information', 'mentions', 'offers', 'plan', 'provides', 'recommends',
+    'references', 'showing', 'specifies', 'specific', 'steps', 'suggests', 'their', 'there', 'these',
+    'through', 'user', "user's", 'users', 'using', 'where', 'which', 'while', 'with',
+}
+
+_QUOTED_PATTERN = re.compile(r"(?<![A-Za-z])'([^']{3,}?)'(?![A-Za-z])|\"([^\"]{3,})\"")
+_PARENTHESIZED_PATTERN = re.compile(r"\(([^)]+)\)")
+_VERSION_PATTERN = re.compile(r"\bv\d+(?:\.\d+)+\b", re.IGNORECASE)
+_NUMBER_PATTERN = re.compile(r"(?<![\w.])\d+(?:[.,]\d+)*%?")
+_WORD_PATTERN = re.compile(r"[A-Za-z][A-Za-z0-9'\-]+")
+
+# Literal facts worth checking before paying for LLM judges
+_FACT_NUMBER_PATTERN = re.compile(r"(?<![\w.])\d+(?:[.,]\d+)*(?:%|[KMB]\b)?")
+_FACT_NAME_PATTERN = re.compile(r"(?<=\s)[A-Z][A-Za-z0-9\-]{2,}")
+_ERROR_MARKERS = ("error:", "exception:", "traceback", "i'm sorry, but i can't", "i cannot help")
+
+# Responses matching fewer than this fraction of literal facts skip the judges
+PRESCORE_FLOOR = 0.1
+
+
+def extract_criterion_keywords(criterion: str) -> List[str]:
+    """
+    Extract the terms a response should contain to satisfy a criterion
+
+    Quoted and parenthesized phrases, versions and numbers are kept whole;
+    remaining words are kept when they are capitalized (names, products)
+    or long enough to be meaningful.
+
+    Args:
+        criterion: Single evaluation criterion from scenarios.json
+
+    Returns:
+        Lowercased keywords, in order of appearance, without duplicates
+    """
+    keywords = []
+    for match in _QUOTED_PATTERN.finditer(criterion):
+        keywords.append(match.group(1) or match.group(2))
+    for match in _PARENTHESIZED_PATTERN.finditer(criterion):
+        keywords.extend(part.strip() for part in match.group(1).split(','))
+    keywords.extend(_VERSION_PATTERN.findall(criterion))
+    keywords.extend(_NUMBER_PATTERN.findall(criterion))
+
+    remainder = _PARENTHESIZED_PATTERN.sub(' ', _QUOTED_PATTERN.sub(' ', criterion))
+    for position, word in enumerate(_WORD_PATTERN.findall(remainder)):
+        is_name = position > 0 and word[0].isupper()
+        if (is_name or len(word) >= 5) and word.lower() not in _STOPWORDS:
+            keywords.append(word)
+
+    seen = set()
+    unique_keywords = []
+    for keyword in keywords:
+        keyword = keyword.lower().strip()
+        if keyword and keyword not in seen:
+            seen.add(keyword)
+            unique_keywords.append(keyword)
+    return unique_keywords
+
+
+def score_criterion(response_text: str, criterion: str) -> float:
+    """
+    Score a single criterion as the fraction of its keywords found
+
+    Args:
+        response_text: Lowercased response to score
+        criterion: Evaluation criterion to check
+
+    Returns:
+        Score between 0 and 1
+    """
+    keywords = extract_criterion_keywords(criterion)
+    if not keywords:
+        return 0.0
+    return sum(1 for keyword in keywords if keyword in response_text) / len(keywords)
+
+
+def score_response_locally(response: str, evaluation_criteria: Dict[str, List[str]]) -> Dict[str, float]:
+    """
+    Score a response against every evaluation criterion without an LLM
+
+    Args:
+        response: AI response to score
+        evaluation_criteria: Criteria lists by dimension from the scenario
+
+    Returns:
+        Dict mapping each dimension and 'overall' to a 0-1 score
+    """
+    response_text = (response or "").lower()
+
+    scores = {}
+    for dimension in SCORE_DIMENSIONS:
+        criteria = evaluation_criteria.get(dimension, [])
+        criterion_scores = [score_criterion(response_text, criterion) for criterion in criteria]
+        scores[dimension] = sum(criterion_scores) / len(criterion_scores) if criterion_scores else 0.0
+
+    scores['overall'] = sum(scores[dimension] for dimension in SCORE_DIMENSIONS) / len(SCORE_DIMENSIONS)
+    return scores
+
+
+class AhoCorasick:
+    """
+    Multi-pattern substring matcher (Aho-Corasick automaton)
+
+    Builds the trie and failure links once, then finds every pattern in a
+    text with a single pass, regardless of how many patterns there are.
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns = list(patterns)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[Set[int]] = [set()]
+
+        for index, pattern in enumerate(self.patterns):
+            state = 0
+            for char in pattern:
+                if char not in self._goto[state]:
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append(set())
+                    self._goto[state][char] = len(self._goto) - 1
+                state = self._goto[state][char]
+            self._output[state].add(index)
+
+        # Breadth-first pass to link each state to its longest proper suffix
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                if self._fail[next_state] == next_state:
+                    self._fail[next_state] = 0
+                self._output[next_state] |= self._output[self._fail[next_state]]
+
+    def find_all(self, text: str) -> Set[int]:
+        """
+        Find which patterns occur in the text
+
+        Args:
+            text: Text to search
+
+        Returns:
+            Indices (into self.patterns) of every pattern found
+        """
+        found = set()
+        state = 0
+        for char in text:
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            found |= self._output[state]
+        return found
+
+
+def extract_literal_facts(evaluation_criteria: Dict[str, List[str]]) -> Tuple[str, ...]:
+    """
+    Extract literal facts (versions, names, numbers) from evaluation criteria
+
+    Args:
+        evaluation_criteria: Criteria lists by dimension from the scenario
+
+    Returns:
+        Sorted tuple of lowercased facts, suitable as a cache key
+    """
+    facts = set()
+    for criteria in evaluation_criteria.values():
+        for criterion in criteria:
+            facts.update(_VERSION_PATTERN.findall(criterion))
+            facts.update(_FACT_NUMBER_PATTERN.findall(_VERSION_PATTERN.sub(' ', criterion)))
+            facts.update(_FACT_NAME_PATTERN.findall(criterion))
+    # Single characters match almost any text, so they carry no signal
+    return tuple(sorted(fact.lower() for fact in facts if len(fact) > 1))
+
+
+@lru_cache(maxsize=64)
+def _fact_matcher(facts: Tuple[str, ...]) -> AhoCorasick:
+    """Build (once per scenario) the matcher for a set of literal facts"""
+    return AhoCorasick(facts)
+
+
+def prescore_response(response: Optional[str], evaluation_criteria: Dict[str, List[str]],
+                      finish_reason: Optional[str] = None) -> Dict:
+    """
+    Cheap pre-screen of a response before sending it to the LLM judges
+
+    Flags empty, truncated (finish reason "length") and error responses
+    outright, otherwise scores the fraction of the scenario's literal facts
+    that appear in the response.
+
+    Args:
+        response: AI response to pre-screen
+        evaluation_criteria: Criteria lists by dimension from the scenario
+        finish_reason: Why the model stopped generating, if known
+
+    Returns:
+        Dict with prescore, matched/total fact counts, pass flag and reason
+    """
+    text = (response or "").strip().lower()
+    facts = extract_literal_facts(evaluation_criteria)
+
+    if not text:
+        return {'prescore': 0.0, 'matched_facts': 0, 'total_facts': len(facts), 'passed': False, 'reason': 'empty response'}
+    if finish_reason == 'length':
+        # A cut-off answer is incomplete however many facts it got to
+        return {'prescore': 0.0, 'matched_facts': 0, 'total_facts': len(facts), 'passed': False, 'reason': 'truncated response'}
+    if text.startswith(_ERROR_MARKERS):
+        return {'prescore': 0.0, 'matched_facts': 0, 'total_facts': len(facts), 'passed': False, 'reason': 'error message'}
+    if not facts:
+        return {'prescore': 1.0, 'matched_facts': 0, 'total_facts': 0, 'passed': True, 'reason': None}
+
+    matched = len(_fact_matcher(facts).find_all(text))
+    prescore = matched / len(facts)
+    passed = prescore >= PRESCORE_FLOOR
+    return {
+        'prescore': prescore,
+        'matched_facts': matched,
+        'total_facts': len(facts),
+        'passed': passed,
+        'reason': None if passed else f'only {matched}/{len(facts)} literal facts found',
+    }
@@ -0,0 +1,189 @@
+"""
+Format auto-selection for Factor 3 production calls
+Turns measured quality/token/latency results into a per-model format choice
+"""
+
+import json
+from typing import Dict, List, Optional
+
+from analysis import _aggregate_format_results, _calculate_format_statistics
+from formatters import FORMATS
+from models import Scenario
+
+
+def _dominates(a: Dict, b: Dict) -> bool:
+    """
+    Check whether format stats `a` Pareto-dominate format stats `b`
+
+    A format dominates another when it is at least as good on every axis
+    (higher quality, fewer tokens, lower latency) and strictly better on one.
+
+    Args:
+        a: Statistical summary for the first format
+        b: Statistical summary for the second format
+
+    Returns:
+        True if `a` dominates `b`
+    """
+    at_least_as_good = (
+        a['avg_quality'] >= b['avg_quality']
+        and a['avg_tokens'] <= b['avg_tokens']
+        and a['avg_time'] <= b['avg_time']
+    )
+    strictly_better = (
+        a['avg_quality'] > b['avg_quality']
+        or a['avg_tokens'] < b['avg_tokens']
+        or a['avg_time'] < b['avg_time']
+    )
+    return at_least_as_good and strictly_better
+
+
+def compute_pareto_frontier(quality_by_format: Dict) -> Dict:
+    """
+    Compute the quality vs tokens vs latency Pareto frontier
+
+    Args:
+        quality_by_format: Statistical summaries by format (see analysis.py)
+
+    Returns:
+        Dict with only the non-dominated formats
+    """
+    return {
+        format_name: stats
+        for format_name, stats in quality_by_format.items()
+        if not any(
+            _dominates(other, stats)
+            for other_name, other in quality_by_format.items()
+            if other_name != format_name
+        )
+    }
+
+
+def build_frontiers(results_data: Dict) -> Dict[str, Dict]:
+    """
+    Build a Pareto frontier for every model present in the results
+
+    Only formats that still exist in FORMATS are considered, so stale
+    results files cannot select a format the runtime can't apply.
+
+    Args:
+        results_data: Complete test results from factor3_test.py
+
+    Returns:
+        Dict mapping model keys to their frontier format statistics
+    """
+    model_keys = sorted({
+        model_key
+        for scenario_results in results_data.values()
+        for format_results in scenario_results.values()
+        for model_key in format_results
+    })
+
+    frontiers = {}
+    for model_key in model_keys:
+        format_aggregates = _aggregate_format_results(results_data, [model_key])
+        quality_by_format = {
+            format_name: stats
+            for format_name, stats in _calculate_format_statistics(format_aggregates).items()
+            if format_name in FORMATS
+        }
+        frontiers[model_key] = compute_pareto_frontier(quality_by_format)
+
+    return frontiers
+
+
+class FormatSelector:
+    """
+    Picks the cheapest context format that meets a quality floor and budget
+
+    The selector is built once from aggregated results and then answers
+    per-request selections from the precomputed frontiers.
+    """
+
+    def __init__(self, results_data: Dict):
+        self.frontiers = build_frontiers(results_data)
+
+    @classmethod
+    def from_file(cls, filename: str) -> 'FormatSelector':
+        """Create a selector from a saved results JSON file"""
+        with open(filename, 'r') as f:
+            return cls(json.load(f))
+
+    def candidates(self, model_key: str, quality_floor: float = 0.0,
+                   max_cost: Optional[float] = None) -> List[str]:
+        """
+        List frontier formats meeting the constraints, cheapest first
+
+        Args:
+            model_key: Short model identifier (e.g., "gpt-4.1")
+            quality_floor: Minimum average quality score required
+            max_cost: Maximum average cost per call in dollars (None = no budget)
+
+        Returns:
+            Format names ordered by average cost, then latency
+        """
+        if model_key not in self.frontiers:
+            raise ValueError(f"No results for model: {model_key}. Available: {list(self.frontiers.keys())}")
+
+        eligible = [
+            (format_name, stats)
+            for format_name, stats in self.frontiers[model_key].items()
+            if stats['avg_quality'] >= quality_floor
+            and (max_cost is None or stats['avg_cost'] <= max_cost)
+        ]
+        eligible.sort(key=lambda x: (x[1]['avg_cost'], x[1]['avg_time']))
+        return [format_name for format_name, _ in eligible]
+
+    def select(self, model_key: str, quality_floor: float = 0.0,
+               max_cost: Optional[float] = None) -> Optional[str]:
+        """
+        Select the cheapest format meeting the quality floor and budget
+
+        Args:
+            model_key: Short model identifier (e.g., "gpt-4.1")
+            quality_floor: Minimum average quality score required
+            max_cost: Maximum average cost per call in dollars (None = no budget)
+
+        Returns:
+            Format name from FORMATS, or None if no format satisfies the constraints
+        """
+        candidates = self.candidates(model_key, quality_floor, max_cost)
+        return candidates[0] if candidates else None
+
+    def format_messages(self, scenario: Scenario, model_key: str, quality_floor: float = 0.0,
+                        max_cost: Optional[float] = None) -> List[Dict]:
+        """
+        Format a scenario with the selected format for a production call
+
+        Args:
+            scenario: Scenario to format
+            model_key: Short model identifier (e.g., "gpt-4.1")
+            quality_floor: Minimum average quality score required
+            max_cost: Maximum average cost per call in dollars (None = no budget)
+
+        Returns:
+            Messages ready to send to the model
+        """
+        format_name = self.select(model_key, quality_floor, max_cost)
+        if format_name is None:
+            raise ValueError(
+                f"No format for {model_key} meets quality >= {quality_floor}"
+                + (f" within ${max_cost:.5f}" if max_cost is not None else "")
+            )
+        return FORMATS[format_name](scenario)
+
+
+def display_frontiers(selector: FormatSelector) -> None:
+    """
+    Display the Pareto frontier for each model
+
+    Args:
+        selector: Selector built from aggregated results
+    """
+    print(f"\n🧭 FORMAT FRONTIER BY MODEL (quality vs tokens vs latency)")
+    print("-" * 60)
+
+    for model_key, frontier in selector.frontiers.items():
+        print(f"\n{model_key}:")
+        for format_name, stats in sorted(frontier.items(), key=lambda x: x[1]['avg_cost']):
+            print(f"  {format_name:<30} Quality: {stats['avg_quality']:.3f} | Tokens: {stats['avg_tokens']:.0f} | Time: {stats['avg_time']:.2f}s | Cost: ${stats['avg_cost']:.5f}")
@@ -0,0 +1,212 @@
+"""
+Background telemetry export for Factor 3 testing
+Moves Langfuse generation logging and metric recording off the request path
+
+Trace context is captured on the calling thread/task when an event is
+submitted (langfuse_context is contextvar-based and would be empty or wrong
+on the exporter thread). Events go into a bounded queue; a single daemon
+thread drains it in batches. When the queue is full, events are dropped and
+counted rather than blocking the caller.
+"""
+
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+from langfuse import Langfuse
+from langfuse.decorators import langfuse_context
+
+from metrics import record_completion, record_judge_disagreement
+
+TELEMETRY_QUEUE_SIZE = 1000
+TELEMETRY_BATCH_SIZE = 50
+TELEMETRY_FLUSH_INTERVAL = 1.0
+
+
+def capture_trace_context() -> Dict[str, Optional[str]]:
+    """
+    Snapshot the current Langfuse trace/observation ids
+
+    Must be called on the thread or asyncio task that owns the trace,
+    before handing work to another thread.
+
+    Returns:
+        Dict with existing_trace_id and parent_observation_id
+    """
+    return {
+        "existing_trace_id": langfuse_context.get_current_trace_id(),
+        "parent_observation_id": langfuse_context.get_current_observation_id(),
+    }
+
+
+def _to_datetime(timestamp: float) -> datetime:
+    """Convert a time.time() timestamp to an aware datetime for Langfuse"""
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc)
+
+
+class TelemetryExporter:
+    """
+    Bounded, batched background exporter for telemetry events
+
+    submit() only timestamps and enqueues; the Langfuse client calls and
+    metric recording happen on the exporter thread. Enqueue and export
+    time are tracked separately so the hot-path overhead can be reported.
+    """
+
+    def __init__(self, max_queue: int = TELEMETRY_QUEUE_SIZE, batch_size: int = TELEMETRY_BATCH_SIZE,
+                 flush_interval: float = TELEMETRY_FLUSH_INTERVAL):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue[Optional[Dict]]" = queue.Queue(maxsize=max_queue)
+        self._handlers: Dict[str, Callable[[Dict], None]] = {
+            "generation": self._export_generation,
+            "judge_disagreement": self._export_judge_disagreement,
+        }
+        self._langfuse: Optional[Langfuse] = None
+        self._thread = threading.Thread(target=self._run, name="telemetry-exporter", daemon=True)
+
+        self.submitted = 0
+        self.dropped = 0
+        self.exported = 0
+        self.failed = 0
+        self.enqueue_seconds = 0.0
+        self.export_seconds = 0.0
+
+        self._thread.start()
+
+    def submit(self, kind: str, payload: Dict) -> bool:
+        """
+        Enqueue a telemetry event without blocking
+
+        Args:
+            kind: Event kind ("generation" or "judge_disagreement")
+            payload: Event data, including any captured trace context
+
+        Returns:
+            True if queued, False if dropped because the queue was full
+        """
+        start = time.perf_counter()
+        try:
+            self._queue.put_nowait({"kind": kind, "payload": payload})
+            self.submitted += 1
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+        finally:
+            self.enqueue_seconds += time.perf_counter() - start
+
+    def shutdown(self, timeout: float = 10.0) -> None:
+        """Drain remaining events, flush Langfuse and stop the exporter thread"""
+        self._queue.put({"kind": "stop", "payload": {}})
+        self._thread.join(timeout)
+        if self._langfuse is not None:
+            self._langfuse.flush()
+
+    def overhead_stats(self) -> Dict:
+        """
+        Summarize exporter throughput and critical-path overhead
+
+        Returns:
+            Dict with event counts and mean enqueue/export time in microseconds
+        """
+        return {
+            "submitted": self.submitted,
+            "dropped": self.dropped,
+            "exported": self.exported,
+            "failed": self.failed,
+            "mean_enqueue_us": self.enqueue_seconds / self.submitted * 1e6 if self.submitted else 0.0,
+            "mean_export_us": self.export_seconds / self.exported * 1e6 if self.exported else 0.0,
+        }
+
+    def _run(self) -> None:
+        """Exporter thread: collect events into batches and export them"""
+        running = True
+        while running:
+            batch: List[Dict] = []
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                try:
+                    event = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if event["kind"] == "stop":
+                    running = False
+                    break
+                batch.append(event)
+            if batch:
+                self._export_batch(batch)
+
+    def _export_batch(self, batch: List[Dict]) -> None:
+        """Export a batch of events, isolating failures per event"""
+        start = time.perf_counter()
+        for event in batch:
+            try:
+                self._handlers[event["kind"]](event["payload"])
+                self.exported += 1
+            except Exception as e:
+                self.failed += 1
+                print(f"⚠️  Telemetry export failed ({event['kind']}): {e}")
+        self.export_seconds += time.perf_counter() - start
+
+    def _client(self) -> Langfuse:
+        """Create the Langfuse client on the exporter thread on first use"""
+        if self._langfuse is None:
+            self._langfuse = Langfuse()
+        return self._langfuse
+
+    def _export_generation(self, payload: Dict) -> None:
+        """Log a model completion to Langfuse and record its metrics"""
+        result = payload["result"]
+        trace_context = payload["trace_context"]
+        self._client().generation(
+            trace_id=trace_context["existing_trace_id"],
+            parent_observation_id=trace_context["parent_observation_id"],
+            name="litellm-completion",
+            model=payload["model"],
+            input=payload["messages"],
+            output=result.get("response"),
+            start_time=_to_datetime(payload["start_time"]),
+            end_time=_to_datetime(payload["end_time"]),
+            usage={"input": result.get("input_tokens"), "output": result.get("output_tokens")},
+            metadata={"labels": payload["labels"], "cost": result.get("cost"), "error": payload.get("error")},
+            level="ERROR" if payload.get("error") else "DEFAULT",
+        )
+        if not payload.get("error"):
+            record_completion(result, payload["labels"])
+
+    def _export_judge_disagreement(self, payload: Dict) -> None:
+        """Record the judge score spread for one response"""
+        record_judge_disagreement(payload["overall_scores"], payload["labels"])
+
+
+_exporter: Optional[TelemetryExporter] = None
+_exporter_lock = threading.Lock()
+
+
+def get_exporter() -> TelemetryExporter:
+    """Return the process-wide exporter, starting it on first use"""
+    global _exporter
+    with _exporter_lock:
+        if _exporter is None:
+            _exporter = TelemetryExporter()
+        return _exporter
+
+
+def shutdown_exporter() -> Optional[Dict]:
+    """
+    Stop the process-wide exporter if it was started
+
+    Returns:
+        Final overhead stats, or None if no exporter was running
+    """
+    global _exporter
+    with _exporter_lock:
+        if _exporter is None:
+            return None
+        _exporter.shutdown()
+        stats = _exporter.overhead_stats()
+        _exporter = None
+        return stats
@@ -0,0 +1,113 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from analysis import _aggregate_format_results, _calculate_format_statistics
+from scoring import AhoCorasick, extract_literal_facts, prescore_response, score_response_locally
+
+CRITERIA = {
+    "specificity": ["Mentions PostgreSQL v14.2", "Sets max_connections to 200"],
+    "actionability": ["Uses 'pg_dump' for the backup"],
+}
+
+
+FULL_RESPONSE = "Upgrade PostgreSQL to v14.2, set max_connections to 200 and back up with pg_dump before the backup window."
+
+
+def test_score_response_locally_scores_each_dimension():
+    scores = score_response_locally("Upgrade PostgreSQL to v14.2, set max_connections to 200.", CRITERIA)
+    assert scores["specificity"] == 1.0
+    assert scores["actionability"] == 0.0
+    # Dimensions without criteria score 0 and still count towards overall
+    assert scores["personalization"] == scores["context_utilization"] == 0.0
+    assert scores["overall"] == 0.25
+
+
+def test_score_response_locally_gives_partial_credit():
+    scores = score_response_locally("Upgrade PostgreSQL.", CRITERIA)
+    assert scores["specificity"] == 0.25
+    assert score_response_locally(FULL_RESPONSE, CRITERIA)["actionability"] == 1.0
+
+
+def test_score_response_locally_handles_missing_response():
+    scores = score_response_locally(None, CRITERIA)
+    assert set(scores) == {"specificity", "personalization", "actionability", "context_utilization", "overall"}
+    assert all(value == 0.0 for value in scores.values())
+
+
+def test_score_response_locally_in_spawned_worker():
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+        scores = pool.submit(score_response_locally, FULL_RESPONSE, CRITERIA).result(timeout=60)
+    assert scores == score_response_locally(FULL_RESPONSE, CRITERIA)
+
+
+def test_aho_corasick_finds_overlapping_patterns():
+    matcher = AhoCorasick(["he", "she", "his", "hers"])
+    found = matcher.find_all("ushers")
+    assert {matcher.patterns[index] for index in found} == {"he", "she", "hers"}
+
+
+def test_aho_corasick_without_matches():
+    assert AhoCorasick(["kubectl"]).find_all("helm install") == set()
+
+
+def test_extract_literal_facts_keeps_versions_and_numbers():
+    facts = extract_literal_facts(CRITERIA)
+    assert "v14.2" in facts
+    assert "200" in facts
+    assert facts == tuple(sorted(facts))
+
+
+def test_prescore_passes_response_with_facts():
+    result = prescore_response("Upgrade to PostgreSQL v14.2 and set max_connections=200.", CRITERIA, "stop")
+    assert result["passed"]
+    assert result["matched_facts"] >= 2
+
+
+def test_prescore_fails_truncated_response_even_with_facts():
+    result = prescore_response("Upgrade to PostgreSQL v14.2 and", CRITERIA, "length")
+    assert not result["passed"]
+    assert result["reason"] == "truncated response"
+
+
+def test_prescore_fails_empty_and_error_responses():
+    assert prescore_response("   ", CRITERIA)["reason"] == "empty response"
+    assert prescore_response("Error: rate limited", CRITERIA)["reason"] == "error message"
+
+
+def test_prescore_fails_response_without_facts():
+    result = prescore_response("Have you tried turning it off and on again?", CRITERIA)
+    assert not result["passed"]
+    assert result["prescore"] == 0.0
+
+
+def _result(overall, prescreened=False):
+    quality = {"overall": overall}
+    if prescreened:
+        quality["prescreened"] = True
+    return {"quality": quality, "total_tokens": 100, "cost": 0.01, "time": 1.0}
+
+
+def test_prescreened_results_count_as_zero_quality():
+    results = {"scenario": {"structured": {"gpt-4.1": _result(0.8), "sonnet-4": _result(0.0, prescreened=True)}}}
+    stats = _calculate_format_statistics(_aggregate_format_results(results))["structured"]
+    assert stats["avg_quality"] == 0.4
+    assert stats["sample_size"] == 2
+    assert stats["prescreened"] == 1
+    assert stats["prescreen_rate"] == 0.5
+    assert stats["avg_cost"] == 0.01
+
+
+def test_format_that_fails_prescreen_ranks_below_one_that_never_fails():
+    results = {"scenario": {
+        "flaky": {"gpt-4.1": _result(0.8), "sonnet-4": _result(0.0, prescreened=True)},
+        "steady": {"gpt-4.1": _result(0.7), "sonnet-4": _result(0.7)},
+    }}
+    stats = _calculate_format_statistics(_aggregate_format_results(results))
+    assert stats["steady"]["avg_quality"] > stats["flaky"]["avg_quality"]
+
+
+def test_format_with_only_prescreened_results_scores_zero():
+    results = {"scenario": {"structured": {"gpt-4.1": _result(0.0, prescreened=True)}}}
+    stats = _calculate_format_statistics(_aggregate_format_results(results))["structured"]
+    assert stats["avg_quality"] == 0.0
+    assert stats["prescreen_rate"] == 1.0
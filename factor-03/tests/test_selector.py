@@ -0,0 +1,58 @@
+import pytest
+
+from selector import FormatSelector, _dominates, compute_pareto_frontier
+
+BASELINE = "Standard Messages (Baseline)"
+XML = "XML Structured (Factor 3)"
+COMPRESSED = "Compressed (Factor 3)"
+
+
+def _stats(quality, tokens, time, cost):
+    return {"avg_quality": quality, "avg_tokens": tokens, "avg_time": time, "avg_cost": cost}
+
+
+def test_dominates_requires_one_strictly_better_axis():
+    a = _stats(0.8, 100, 1.0, 0.01)
+    assert not _dominates(a, dict(a))
+    assert _dominates(_stats(0.9, 100, 1.0, 0.01), a)
+    assert not _dominates(_stats(0.9, 200, 1.0, 0.01), a)
+
+
+def test_pareto_frontier_drops_dominated_formats():
+    frontier = compute_pareto_frontier({
+        "best": _stats(0.9, 100, 1.0, 0.01),
+        "dominated": _stats(0.8, 150, 1.5, 0.02),
+        "cheap": _stats(0.6, 50, 1.0, 0.005),
+    })
+    assert set(frontier) == {"best", "cheap"}
+
+
+def _result(quality, tokens, time, cost):
+    return {"quality": {"overall": quality}, "total_tokens": tokens, "time": time, "cost": cost}
+
+
+@pytest.fixture
+def selector():
+    return FormatSelector({
+        "scenario": {
+            BASELINE: {"gpt-4.1": _result(0.6, 300, 2.0, 0.03)},
+            XML: {"gpt-4.1": _result(0.9, 200, 1.5, 0.02)},
+            COMPRESSED: {"gpt-4.1": _result(0.7, 100, 1.0, 0.01)},
+            "Removed Format": {"gpt-4.1": _result(1.0, 10, 0.1, 0.001)},
+        }
+    })
+
+
+def test_selector_ignores_unknown_and_dominated_formats(selector):
+    assert set(selector.frontiers["gpt-4.1"]) == {XML, COMPRESSED}
+
+
+def test_selector_picks_cheapest_format_meeting_the_floor(selector):
+    assert selector.select("gpt-4.1") == COMPRESSED
+    assert selector.select("gpt-4.1", quality_floor=0.8) == XML
+    assert selector.select("gpt-4.1", quality_floor=0.8, max_cost=0.015) is None
+
+
+def test_selector_rejects_unknown_model(selector):
+    with pytest.raises(ValueError):
+        selector.select("unknown-model")
@@ -0,0 +1,231 @@
+"""
+Model pricing and per-session cost accounting shared by the factor demos
+
+Rates are stored per token, precomputed from the published per-million
+prices, so costing a call is a dict lookup and a few multiplications.
+"""
+
+import threading
+import warnings
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional, Tuple
+
+PER_MILLION = 1_000_000
+
+
+@dataclass(frozen=True)
+class ModelPricing:
+    """Per-token USD rates for one model"""
+
+    input: float
+    output: float
+    cached_input: float
+    cache_write: float
+    reasoning: float
+
+    @classmethod
+    def per_million(cls, input: float, output: float, cached_input: Optional[float] = None,
+                    cache_write: Optional[float] = None, reasoning: Optional[float] = None) -> "ModelPricing":
+        """
+        Build pricing from USD per million tokens
+
+        Cached input defaults to the input rate, cache writes to the input
+        rate, and reasoning tokens to the output rate.
+        """
+        return cls(
+            input=input / PER_MILLION,
+            output=output / PER_MILLION,
+            cached_input=(input if cached_input is None else cached_input) / PER_MILLION,
+            cache_write=(input if cache_write is None else cache_write) / PER_MILLION,
+            reasoning=(output if reasoning is None else reasoning) / PER_MILLION,
+        )
+
+    def cost(self, input_tokens: int = 0, output_tokens: int = 0, cached_input_tokens: int = 0,
+             cache_write_tokens: int = 0, reasoning_tokens: int = 0) -> float:
+        """
+        Cost of one call in USD
+
+        Args:
+            input_tokens: Uncached input tokens
+            output_tokens: Visible output tokens, excluding reasoning tokens
+            cached_input_tokens: Input tokens read from the prompt cache
+            cache_write_tokens: Input tokens written to the prompt cache
+            reasoning_tokens: Hidden reasoning/thinking tokens
+
+        Returns:
+            Cost in USD
+        """
+        return (
+            input_tokens * self.input
+            + output_tokens * self.output
+            + cached_input_tokens * self.cached_input
+            + cache_write_tokens * self.cache_write
+            + reasoning_tokens * self.reasoning
+        )
+
+
+_CLAUDE_SONNET = ModelPricing.per_million(3.00, 15.00, cached_input=0.30, cache_write=3.75)
+
+# Keyed by model id without provider prefix (litellm's "gemini/..." etc.)
+PRICING: Dict[str, ModelPricing] = {
+    "claude-3-7-sonnet-20250219": _CLAUDE_SONNET,
+    "claude-sonnet-4-20250514": _CLAUDE_SONNET,
+    "gpt-4.1-2025-04-14": ModelPricing.per_million(2.00, 8.00, cached_input=0.50),
+    "gemini-2.5-pro-preview-05-06": ModelPricing.per_million(1.25, 10.00, cached_input=0.31),
+}
+
+
+@lru_cache(maxsize=None)
+def get_pricing(model: str) -> ModelPricing:
+    """
+    Look up pricing for a model id
+
+    Args:
+        model: Model id, optionally with a litellm provider prefix
+
+    Returns:
+        ModelPricing for the model
+
+    Raises:
+        KeyError: If the model has no pricing entry
+    """
+    name = model.rsplit("/", 1)[-1]
+    if name not in PRICING:
+        raise KeyError(f"no pricing for model {model!r}")
+    return PRICING[name]
+
+
+def _field(obj: Any, name: str) -> int:
+    """Read an optional token count from an SDK object or dict"""
+    value = obj.get(name) if isinstance(obj, dict) else getattr(obj, name, None)
+    return value or 0
+
+
+def anthropic_usage_tokens(usage: Any) -> Dict[str, int]:
+    """
+    Token counts from an Anthropic SDK Usage object
+
+    Anthropic reports cache reads and writes separately from input_tokens.
+    """
+    return {
+        "input_tokens": _field(usage, "input_tokens"),
+        "output_tokens": _field(usage, "output_tokens"),
+        "cached_input_tokens": _field(usage, "cache_read_input_tokens"),
+        "cache_write_tokens": _field(usage, "cache_creation_input_tokens"),
+    }
+
+
+def openai_usage_tokens(usage: Any) -> Dict[str, int]:
+    """
+    Token counts from an OpenAI-format usage object (as returned by litellm)
+
+    prompt_tokens includes cached tokens and completion_tokens includes
+    reasoning tokens, so both are split out to avoid double counting.
+    """
+    prompt_details = _field(usage, "prompt_tokens_details") or {}
+    completion_details = _field(usage, "completion_tokens_details") or {}
+    cached = _field(prompt_details, "cached_tokens") or _field(usage, "cache_read_input_tokens")
+    cache_write = _field(usage, "cache_creation_input_tokens")
+    reasoning = _field(completion_details, "reasoning_tokens")
+    return {
+        "input_tokens": max(_field(usage, "prompt_tokens") - cached - cache_write, 0),
+        "output_tokens": max(_field(usage, "completion_tokens") - reasoning, 0),
+        "cached_input_tokens": cached,
+        "cache_write_tokens": cache_write,
+        "reasoning_tokens": reasoning,
+    }
+
+
+@dataclass
+class LedgerEntry:
+    """Running totals for one model"""
+
+    calls: int = 0
+    cost: float = 0.0
+    # Calls that had no pricing entry and no fallback cost, recorded at $0
+    unpriced_calls: int = 0
+    tokens: Dict[str, int] = field(default_factory=dict)
+
+
+class CostLedger:
+    """
+    Running cost totals for a session, broken down by model
+
+    Thread-safe, so concurrent tool calls and evaluation workers can share
+    one ledger.
+
+    A call to a model missing from PRICING has already been made (and paid
+    for) by the time it is recorded, so by default it is costed with the
+    caller's fallback, or recorded at $0 with a warning, instead of raising.
+    Pass strict=True to raise KeyError instead, e.g. to keep PRICING complete.
+    """
+
+    def __init__(self, strict: bool = False):
+        self.strict = strict
+        self._entries: Dict[str, LedgerEntry] = {}
+        self._lock = threading.Lock()
+
+    def record(self, model: str, fallback: Optional[Callable[[], float]] = None, **tokens: int) -> float:
+        """
+        Cost a call and add it to the session totals
+
+        Args:
+            model: Model id used for the call
+            fallback: Computes the cost when the model has no pricing entry,
+                e.g. lambda: litellm.completion_cost(response)
+            **tokens: Token counts accepted by ModelPricing.cost
+
+        Returns:
+            Cost of this call in USD
+
+        Raises:
+            KeyError: If the model has no pricing entry and the ledger is strict
+        """
+        unpriced = False
+        try:
+            cost = get_pricing(model).cost(**tokens)
+        except KeyError:
+            if self.strict:
+                raise
+            cost, unpriced = self._fallback_cost(model, fallback)
+
+        with self._lock:
+            entry = self._entries.setdefault(model, LedgerEntry())
+            entry.calls += 1
+            entry.cost += cost
+            entry.unpriced_calls += unpriced
+            for kind, count in tokens.items():
+                entry.tokens[kind] = entry.tokens.get(kind, 0) + count
+        return cost
+
+    @staticmethod
+    def _fallback_cost(model: str, fallback: Optional[Callable[[], float]]) -> Tuple[float, bool]:
+        """Cost from the fallback, or 0.0 with a warning; the flag is True when unpriced"""
+        if fallback is not None:
+            try:
+                return float(fallback() or 0.0), False
+            except Exception as e:
+                warnings.warn(f"no pricing for model {model!r} and fallback failed ({e}); recording $0", RuntimeWarning)
+                return 0.0, True
+        warnings.warn(f"no pricing for model {model!r}; recording $0", RuntimeWarning)
+        return 0.0, True
+
+    @property
+    def total(self) -> float:
+        """Total session cost in USD"""
+        with self._lock:
+            return sum(entry.cost for entry in self._entries.values())
+
+    def summary(self) -> Dict[str, Dict]:
+        """
+        Per-model totals
+
+        Returns:
+            Dict mapping model id to calls, cost and token counts
+        """
+        with self._lock:
+            return {
+                model: {"calls": entry.calls, "cost": entry.cost, "unpriced_calls": entry.unpriced_calls, **entry.tokens}
+                for model, entry in self._entries.items()
+            }
@@ -0,0 +1,55 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shared.pricing import CostLedger, get_pricing, openai_usage_tokens
+
+
+def test_get_pricing_strips_provider_prefix():
+    assert get_pricing("gemini/gemini-2.5-pro-preview-05-06") is get_pricing("gemini-2.5-pro-preview-05-06")
+
+
+def test_cost_uses_per_token_rates():
+    pricing = get_pricing("claude-sonnet-4-20250514")
+    cost = pricing.cost(input_tokens=1_000_000, output_tokens=1_000_000, cached_input_tokens=1_000_000)
+    assert cost == pytest.approx(3.00 + 15.00 + 0.30)
+
+
+def test_openai_usage_splits_cached_and_reasoning_tokens():
+    usage = {
+        "prompt_tokens": 100,
+        "completion_tokens": 50,
+        "prompt_tokens_details": {"cached_tokens": 40},
+        "completion_tokens_details": {"reasoning_tokens": 20},
+    }
+    assert openai_usage_tokens(usage) == {
+        "input_tokens": 60,
+        "output_tokens": 30,
+        "cached_input_tokens": 40,
+        "cache_write_tokens": 0,
+        "reasoning_tokens": 20,
+    }
+
+
+def test_unknown_model_uses_fallback():
+    ledger = CostLedger()
+    assert ledger.record("unknown-model", fallback=lambda: 0.25, input_tokens=10) == 0.25
+    assert ledger.summary()["unknown-model"] == {"calls": 1, "cost": 0.25, "unpriced_calls": 0, "input_tokens": 10}
+
+
+def test_unknown_model_without_fallback_records_zero_and_warns():
+    ledger = CostLedger()
+    with pytest.warns(RuntimeWarning, match="no pricing"):
+        assert ledger.record("unknown-model", input_tokens=10) == 0.0
+    with pytest.warns(RuntimeWarning, match="fallback failed"):
+        ledger.record("unknown-model", fallback=lambda: 1 / 0)
+    assert ledger.summary()["unknown-model"]["unpriced_calls"] == 2
+    assert ledger.total == 0.0
+
+
+def test_strict_ledger_raises_for_unknown_model():
+    with pytest.raises(KeyError):
+        CostLedger(strict=True).record("unknown-model", input_tokens=10)